@@ -0,0 +1,337 @@
+"""
+Benchmarks sin pantalla de los caminos críticos del juego.
+
+    python bench.py run [--out resultados.json] [--only nombre ...]
+    python bench.py compare base.json nuevo.json [--threshold 0.10]
+
+Los benchmarks de dibujo usan un contexto OpenGL offscreen (EGL sin
+superficie, p. ej. Mesa llvmpipe); si no hay uno disponible se omiten.
+"""
+import os
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import numpy as np
+
+BENCHMARKS = []
+
+def benchmark(name, iterations, gl=False):
+    """Registra un benchmark: la función prepara el escenario y devuelve la operación a medir."""
+    def register(setup):
+        BENCHMARKS.append((name, iterations, gl, setup))
+        return setup
+    return register
+
+# -----------------------
+# Contexto GL offscreen
+# -----------------------
+
+def make_offscreen_context(width=800, height=600):
+    """Crea un contexto EGL sin ventana; devuelve el renderer o None si no se pudo."""
+    try:
+        import ctypes
+        from OpenGL import EGL
+        from OpenGL.EGL.EXT.platform_base import eglGetPlatformDisplayEXT
+        from OpenGL.GL import glGetString, GL_RENDERER
+
+        EGL_PLATFORM_SURFACELESS_MESA = 0x31DD
+        dpy = eglGetPlatformDisplayEXT(EGL_PLATFORM_SURFACELESS_MESA, None, None)
+        major, minor = EGL.EGLint(), EGL.EGLint()
+        if not EGL.eglInitialize(dpy, ctypes.pointer(major), ctypes.pointer(minor)):
+            return None
+        attrs = [EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+                 EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8,
+                 EGL.EGL_ALPHA_SIZE, 8, EGL.EGL_DEPTH_SIZE, 24,
+                 EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT, EGL.EGL_NONE]
+        config, count = EGL.EGLConfig(), EGL.EGLint()
+        EGL.eglChooseConfig(dpy, (EGL.EGLint * len(attrs))(*attrs), ctypes.pointer(config), 1,
+                            ctypes.pointer(count))
+        if count.value == 0:
+            return None
+        size = (EGL.EGLint * 5)(EGL.EGL_WIDTH, width, EGL.EGL_HEIGHT, height, EGL.EGL_NONE)
+        surface = EGL.eglCreatePbufferSurface(dpy, config, size)
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        ctx = EGL.eglCreateContext(dpy, config, EGL.EGL_NO_CONTEXT, None)
+        if not EGL.eglMakeCurrent(dpy, surface, surface, ctx):
+            return None
+        return glGetString(GL_RENDERER).decode()
+    except Exception:
+        return None
+
+# -----------------------
+# Carga de modelos
+# -----------------------
+
+BUNNY = "models/Bunny_lowpoly.obj"
+
+@benchmark("load_obj_bunny", iterations=30)
+def bench_load_obj():
+    from game.utils import load_obj
+    return lambda: load_obj(BUNNY)
+
+@benchmark("parse_obj_bunny", iterations=100)
+def bench_parse_obj():
+    """Lector vectorizado (con normales); load_obj_bunny es el lector línea a línea."""
+    from game.obj import parse_obj
+    return lambda: parse_obj(BUNNY)
+
+@benchmark("parse_stl_bunny", iterations=100)
+def bench_parse_stl():
+    """El mismo conejo en STL binario (frombuffer + soldado)."""
+    from game.stl import parse_stl
+    return lambda: parse_stl("models/Bunny lowpoly.stl")
+
+@benchmark("load_obj_cached_bunny", iterations=500)
+def bench_load_model_cached():
+    from game.model_cache import load_model_cached
+    load_model_cached(BUNNY)  # calienta la cache
+    return lambda: load_model_cached(BUNNY)
+
+# -----------------------
+# Simulación
+# -----------------------
+
+@benchmark("generate_wave", iterations=20000)
+def bench_generate_wave():
+    from game.spawner import generate_wave
+    rng = random.Random(1)
+    return lambda: generate_wave(-30, rng)
+
+@benchmark("sim_step_max_speed_200_entities", iterations=10000)
+def bench_sim_step():
+    """10k frames a velocidad máxima con 200 entidades vivas en el carril."""
+    from game.simulation import GameSimulation
+    from game.spawner import LANES
+    sim = GameSimulation(seed=1)
+    sim.base_speed = 6.0
+    rng = random.Random(2)
+    keys = [(rng.random() < 0.1, rng.random() < 0.1) for _ in range(1024)]
+    frame = [0]
+
+    def op():
+        entities = sim.entities
+        while len(entities) < 200:
+            entities.spawn(rng.randrange(5), rng.choice(LANES), min(entities.min_z(), 0) - 6)
+        sim.health = sim.max_health  # nunca termina
+        left, right = keys[frame[0] % len(keys)]
+        frame[0] += 1
+        sim.step(left, right)
+    return op
+
+@benchmark("replay_headless", iterations=20)
+def bench_replay():
+    """Partida grabada completa (teclas aleatorias hasta el game over) a máxima velocidad."""
+    from game.replay import Replay
+    rng = random.Random(3)
+    recording = Replay(seed=3)
+    sim = recording.new_simulation()
+    left = right = False
+    while not sim.game_over:
+        if rng.random() < 0.05:
+            left, right = rng.random() < 0.5, rng.random() < 0.5
+        recording.record(left, right)
+        sim.step(left, right)
+    recording.finish(sim)
+    replay = Replay.from_bytes(recording.to_bytes())
+    return replay.play
+
+@benchmark("particles_50_bursts", iterations=200)
+def bench_particles():
+    """Ráfaga de 50 explosiones y su vida completa (30 frames)."""
+    from game.particles import ParticlePool
+    pool = ParticlePool(capacity=1024, seed=1)
+
+    def op():
+        for i in range(50):
+            pool.emit(i % 3 * 2 - 2, 0.5, -i, (1, 0.4, 0.4))
+        for _ in range(pool.lifetime):
+            pool.update()
+    return op
+
+# -----------------------
+# Dibujo (requiere contexto GL)
+# -----------------------
+
+@benchmark("draw_text_cached", iterations=2000, gl=True)
+def bench_draw_text_cached():
+    import pygame
+    from game.text import TextRenderer
+    pygame.font.init()
+    font = pygame.font.Font(None, 36)
+    renderer = TextRenderer()
+    return lambda: renderer.draw(600, 570, "Puntos: 1230", font)
+
+@benchmark("draw_text_uncached", iterations=300, gl=True)
+def bench_draw_text_uncached():
+    import pygame
+    from game.text import TextRenderer
+    pygame.font.init()
+    font = pygame.font.Font(None, 36)
+    renderer = TextRenderer()
+    score = [0]
+
+    def op():
+        score[0] += 1
+        renderer.draw(600, 570, f"Puntos: {score[0]}", font)
+    return op
+
+@benchmark("draw_batch_200_entities", iterations=300, gl=True)
+def bench_draw_batch():
+    from OpenGL.GL import glFinish
+    from game.mesh import load_mesh
+    from game.batch import MeshBatch
+    batch = MeshBatch(load_mesh(BUNNY), y=0.1, scale=5, rotations=((180, 0, 1, 0), (-90, 1, 0, 0)))
+    rng = np.random.default_rng(1)
+    xs = rng.choice([-2.0, 0.0, 2.0], 200)
+    zs = rng.uniform(-120, 0, 200)
+
+    def op():
+        batch.draw(xs, zs)
+        glFinish()
+    return op
+
+def _scene_batch(renderer_name):
+    """200 conejos con la cámara del juego a través de un backend de renderer."""
+    from OpenGL.GL import glFinish, glViewport, glEnable, GL_DEPTH_TEST
+    from game.mesh import load_mesh
+    from game.batch import MeshBatch
+    from game.renderer import FixedRenderer, ShaderRenderer
+    renderer = ShaderRenderer() if renderer_name == "glsl" else FixedRenderer()
+    glViewport(0, 0, 800, 600)
+    glEnable(GL_DEPTH_TEST)
+    batch = MeshBatch(load_mesh(BUNNY), y=0.1, scale=5, rotations=((180, 0, 1, 0), (-90, 1, 0, 0)))
+    rng = np.random.default_rng(1)
+    xs = rng.choice([-2.0, 0.0, 2.0], 200)
+    zs = rng.uniform(-120, 0, 200)
+
+    def op():
+        renderer.begin_scene(800 / 600)
+        renderer.draw_batch(batch, xs, zs)
+        renderer.end_scene()
+        glFinish()
+    return op
+
+@benchmark("draw_scene_200_entities_fixed", iterations=50, gl=True)
+def bench_draw_scene_fixed():
+    return _scene_batch("fixed")
+
+@benchmark("draw_scene_200_entities_glsl", iterations=50, gl=True)
+def bench_draw_scene_glsl():
+    return _scene_batch("glsl")
+
+@benchmark("draw_particles_50_bursts", iterations=300, gl=True)
+def bench_draw_particles():
+    from OpenGL.GL import glFinish
+    from game.particles import ParticlePool
+    pool = ParticlePool(capacity=1024, seed=1)
+    for i in range(50):
+        pool.emit(0, 0.5, -i, (1, 1, 0))
+
+    def op():
+        pool.draw()
+        glFinish()
+    return op
+
+# -----------------------
+# Runner
+# -----------------------
+
+def run_benchmark(setup, iterations):
+    op = setup()
+    for _ in range(min(10, iterations)):
+        op()  # calentamiento
+    latencies = np.empty(iterations)
+    start = time.perf_counter()
+    for i in range(iterations):
+        t = time.perf_counter()
+        op()
+        latencies[i] = time.perf_counter() - t
+    total = time.perf_counter() - start
+    p50, p95, p99 = np.percentile(latencies * 1000, (50, 95, 99))
+    return {
+        "iterations": iterations,
+        "ops_per_sec": iterations / total,
+        "mean_ms": float(latencies.mean() * 1000),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+    }
+
+def cmd_run(args):
+    renderer = None
+    if any(gl for _, _, gl, _ in BENCHMARKS):
+        renderer = make_offscreen_context()
+        if renderer is None:
+            print("Sin contexto GL offscreen: se omiten los benchmarks de dibujo")
+
+    results = {}
+    for name, iterations, gl, setup in BENCHMARKS:
+        if args.only and name not in args.only:
+            continue
+        if gl and renderer is None:
+            continue
+        r = run_benchmark(setup, iterations)
+        results[name] = r
+        print(f"{name:36s} {r['ops_per_sec']:12.1f} ops/s   "
+              f"p50 {r['p50_ms']:8.3f} ms   p95 {r['p95_ms']:8.3f} ms   p99 {r['p99_ms']:8.3f} ms")
+
+    data = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "renderer": renderer,
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(data, f, indent=2)
+    return 0
+
+def cmd_compare(args):
+    with open(args.base) as f:
+        base = json.load(f)["results"]
+    with open(args.new) as f:
+        new = json.load(f)["results"]
+
+    regressions = 0
+    for name in sorted(set(base) & set(new)):
+        old_p50, new_p50 = base[name]["p50_ms"], new[name]["p50_ms"]
+        change = (new_p50 - old_p50) / old_p50 if old_p50 else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag = "  <-- MÁS LENTO"
+            regressions += 1
+        print(f"{name:36s} {old_p50:9.3f} ms -> {new_p50:9.3f} ms  ({change:+7.1%}){flag}")
+    for name in sorted(set(base) ^ set(new)):
+        print(f"{name:36s} solo en {'base' if name in base else 'nuevo'}")
+    return 1 if regressions else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de LawnMayhem 3D")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="ejecuta los benchmarks")
+    run.add_argument("--out", help="guarda los resultados en este JSON (baseline)")
+    run.add_argument("--only", nargs="*", help="solo estos benchmarks")
+
+    compare = sub.add_parser("compare", help="compara dos resultados")
+    compare.add_argument("base")
+    compare.add_argument("new")
+    compare.add_argument("--threshold", type=float, default=0.10,
+                         help="aumento relativo de p50 que cuenta como regresión (0.10 = 10%%)")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        return cmd_run(args)
+    return cmd_compare(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+import queue
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from game.mesh import Mesh, lod_chain
+from game.model_cache import load_model_cached
+from game.textures import load_levels
+from game.profiler import profiler
+
+class AssetManager:
+    """
+    Carga de modelos y texturas en segundo plano.
+
+    Leer y procesar los archivos (OBJ/STL -> cache, PNG -> mipmaps) corre en un
+    pool de hilos. OpenGL solo se puede usar desde el hilo de la ventana, así
+    que cada asset leído queda en una cola y process_uploads() lo sube a la
+    GPU durante el frame, sin pasarse de un presupuesto de milisegundos.
+    Cada load_*() devuelve un Future que se completa cuando el asset ya está
+    en la GPU.
+    """
+
+    def __init__(self, textures, workers=4, budget_ms=4.0):
+        self.textures = textures
+        self.budget_ms = budget_ms
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+        self.uploads = queue.Queue()  # (future público, función de subida, datos)
+        self.futures = []  # futures públicos (asset ya en la GPU)
+        self.reads = []    # lecturas en el pool
+        self.meshes = []   # modelos ya subidos (se borran en shutdown)
+
+    def _submit(self, read, upload, *args):
+        public = Future()
+        self.futures.append(public)
+
+        def on_read(work):
+            error = work.exception()
+            if error is not None:
+                public.set_exception(error)
+            else:
+                self.uploads.put((public, upload, work.result()))
+
+        work = self.pool.submit(read, *args)
+        self.reads.append(work)
+        work.add_done_callback(on_read)
+        return public
+
+    def load_mesh(self, path, lods=False):
+        """Future de un Mesh (o de su lod_chain si lods=True) ya subido."""
+        def read():
+            mesh = Mesh(*load_model_cached(path))
+            return lod_chain(mesh) if lods else mesh
+
+        def upload(result):
+            for mesh in (result if lods else [result]):
+                mesh.upload()
+                self.meshes.append(mesh)
+            return result
+
+        return self._submit(read, upload)
+
+    def load_texture(self, path, repeat=False):
+        """Future de (tex_id, (ancho, alto)), como TextureManager.add()."""
+        return self._submit(load_levels, lambda levels: self.textures.add(path, levels, repeat), path)
+
+    def process_uploads(self, budget_ms=None):
+        """Sube a la GPU lo ya leído hasta agotar el presupuesto (al menos un asset por llamada)."""
+        budget_ms = self.budget_ms if budget_ms is None else budget_ms
+        start = time.perf_counter()
+        while True:
+            try:
+                public, upload, data = self.uploads.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                public.set_result(upload(data))
+            except Exception as e:
+                public.set_exception(e)
+            profiler.count("asset_uploads")
+            if (time.perf_counter() - start) * 1000 >= budget_ms:
+                break
+
+    @property
+    def progress(self):
+        """Avance de 0 a 1: la mitad por leer cada asset y la otra mitad por subirlo."""
+        if not self.futures:
+            return 1.0
+        read = sum(f.done() for f in self.reads)
+        uploaded = sum(f.done() for f in self.futures)
+        return (read + uploaded) / (2 * len(self.futures))
+
+    def done(self):
+        return all(f.done() for f in self.futures)
+
+    def shutdown(self):
+        """Cancela las lecturas pendientes y borra los modelos de la GPU (con el contexto todavía vivo)."""
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        for mesh in self.meshes:
+            mesh.delete()
+        self.meshes.clear()
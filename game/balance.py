@@ -0,0 +1,197 @@
+"""
+Balanceo por Monte Carlo: muchas partidas sin pantalla jugadas por bots.
+
+Cada sesión es una GameSimulation con su semilla, manejada por una
+política (bot) y con las reglas de dificultad que se quieran probar. Las
+sesiones se reparten en un pool de procesos y los agregados (puntaje,
+tiempo de supervivencia, tasa de conejos) se imprimen a medida que llegan.
+
+Uso: python -m game.balance --sessions 2000 --policies random greedy avoider
+     python -m game.balance --speed-step 0.2 --max-speed 8 --out resultados.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from game.entities import CONEJO, GNOMO, PIEDRA, HIT_Z_MIN
+from game.simulation import GameSimulation, DIFFICULTY_MS, SPEED_STEP, MAX_SPEED
+from game.spawner import LANES, generate_wave
+
+KIND_NAMES = ("conejo", "gnomo", "piedra", "heart", "shield")
+
+# -----------------------
+# Políticas (bots)
+# -----------------------
+
+def _steer(sim, target_x):
+    """Teclas (left, right) para ir hacia el carril target_x."""
+    return target_x < sim.player_x, target_x > sim.player_x
+
+def _next_in_lanes(sim):
+    """Por carril, el tipo de la entidad más cercana que todavía no llegó al jugador (o -1)."""
+    result = {}
+    for lane in LANES:
+        nearest = sim.entities.nearest(lane, HIT_Z_MIN[CONEJO])
+        result[lane] = -1 if nearest is None else nearest[0]
+    return result
+
+def random_policy(sim, rng):
+    """Cambia de carril al azar de vez en cuando."""
+    r = rng.random()
+    return r < 0.03, 0.03 <= r < 0.06
+
+def greedy_policy(sim, rng):
+    """Va al carril del próximo conejo."""
+    for lane, kind in _next_in_lanes(sim).items():
+        if kind == CONEJO:
+            return _steer(sim, lane)
+    return False, False
+
+def avoider_policy(sim, rng):
+    """Se queda quieto salvo que venga una piedra; entonces busca el carril más cercano sin piedra."""
+    upcoming = _next_in_lanes(sim)
+    if upcoming[sim.player_x] != PIEDRA:
+        return False, False
+    safe = [lane for lane in LANES if upcoming[lane] != PIEDRA]
+    return _steer(sim, min(safe, key=lambda lane: abs(lane - sim.player_x)))
+
+POLICIES = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+    "avoider": avoider_policy,
+}
+
+# -----------------------
+# Sesiones
+# -----------------------
+
+class CountingSimulation(GameSimulation):
+    """GameSimulation que además cuenta los choques por tipo."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.hits = [0] * len(KIND_NAMES)
+
+    def _on_hit(self, kind, x, z):
+        self.hits[kind] += 1
+        super()._on_hit(kind, x, z)
+
+def run_session(seed, policy, rules, max_steps):
+    """Juega una partida completa (o hasta max_steps) y devuelve sus resultados."""
+    sim = CountingSimulation(seed=seed)
+    sim.difficulty_ms = rules["difficulty_ms"]
+    sim.speed_step = rules["speed_step"]
+    sim.max_speed = rules["max_speed"]
+    act = POLICIES[policy]
+    rng = random.Random(seed ^ 0x5EED)
+    steps = 0
+    while not sim.game_over and steps < max_steps:
+        sim.step(*act(sim, rng))
+        steps += 1
+    lane_hits = sim.hits[CONEJO] + sim.hits[GNOMO] + sim.hits[PIEDRA]
+    return {
+        "seed": seed,
+        "policy": policy,
+        "score": sim.score,
+        "survival_s": sim.time_ms / 1000,
+        "finished": sim.game_over,
+        "hit_rate": sim.hits[CONEJO] / lane_hits if lane_hits else 0.0,
+        "hits": dict(zip(KIND_NAMES, sim.hits)),
+        "final_speed": sim.base_speed,
+    }
+
+def powerups_reachable(samples=1000):
+    """Si alguna de ``samples`` oleadas de prueba trae un power-up."""
+    rng = random.Random(0)
+    return any(generate_wave(0, rng)[3] for _ in range(samples))
+
+def run_batch(seeds, policy, rules, max_steps):
+    """Unidad de trabajo de cada proceso (varias sesiones para amortizar el envío)."""
+    return [run_session(seed, policy, rules, max_steps) for seed in seeds]
+
+# -----------------------
+# Agregados
+# -----------------------
+
+def summarize(results):
+    """Distribución (media y percentiles) de cada métrica de un grupo de sesiones."""
+    summary = {"sessions": len(results)}
+    for metric in ("score", "survival_s", "hit_rate"):
+        values = np.array([r[metric] for r in results], dtype=float)
+        p5, p50, p95 = np.percentile(values, (5, 50, 95))
+        summary[metric] = {"mean": float(values.mean()), "p5": float(p5),
+                           "p50": float(p50), "p95": float(p95)}
+    summary["hits"] = {name: int(sum(r["hits"][name] for r in results)) for name in KIND_NAMES}
+    return summary
+
+def format_summary(policy, summary):
+    s, t, h = summary["score"], summary["survival_s"], summary["hit_rate"]
+    hits = " ".join(f"{name}={n}" for name, n in summary["hits"].items())
+    return (f"{policy:8s} n={summary['sessions']:<6d} "
+            f"puntaje {s['mean']:8.1f} (p5 {s['p5']:.0f} p50 {s['p50']:.0f} p95 {s['p95']:.0f})   "
+            f"vida {t['mean']:6.1f} s (p50 {t['p50']:.1f} p95 {t['p95']:.1f})   "
+            f"conejos {h['mean']:.1%}   choques: {hits}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Balanceo con partidas simuladas en paralelo")
+    parser.add_argument("--sessions", type=int, default=1000, help="partidas por política")
+    parser.add_argument("--policies", nargs="+", choices=sorted(POLICIES), default=sorted(POLICIES))
+    parser.add_argument("--seed", type=int, default=0, help="semilla base (sesión i usa seed + i)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="procesos (por defecto: núcleos)")
+    parser.add_argument("--batch", type=int, default=16, help="sesiones por tarea enviada a un proceso")
+    parser.add_argument("--max-minutes", type=float, default=10.0, help="corta las partidas más largas")
+    parser.add_argument("--difficulty-ms", type=float, default=DIFFICULTY_MS)
+    parser.add_argument("--speed-step", type=float, default=SPEED_STEP)
+    parser.add_argument("--max-speed", type=float, default=MAX_SPEED)
+    parser.add_argument("--out", help="guarda todas las sesiones y los agregados en este JSON")
+    args = parser.parse_args(argv)
+
+    rules = {
+        "difficulty_ms": args.difficulty_ms,
+        "speed_step": args.speed_step,
+        "max_speed": args.max_speed,
+    }
+    if not powerups_reachable():
+        print("aviso: las oleadas ocupan los tres carriles, así que nunca aparecen power-ups "
+              "(heart/shield siempre dan 0 choques)", file=sys.stderr)
+    max_steps = int(args.max_minutes * 60 * 60)
+    results = {policy: [] for policy in args.policies}
+    total = args.sessions * len(args.policies)
+    done = 0
+    report_every = max(total // 10, 1)
+    next_report = report_every
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = []
+        for policy in args.policies:
+            seeds = range(args.seed, args.seed + args.sessions)
+            for i in range(0, args.sessions, args.batch):
+                futures.append(pool.submit(run_batch, seeds[i:i + args.batch], policy, rules, max_steps))
+        for future in as_completed(futures):
+            batch = future.result()
+            results[batch[0]["policy"]].extend(batch)
+            done += len(batch)
+            if done >= next_report or done == total:
+                next_report += report_every
+                print(f"[{done}/{total}  {time.perf_counter() - start:.1f} s]")
+                for policy, policy_results in results.items():
+                    if policy_results:
+                        print("  " + format_summary(policy, summarize(policy_results)))
+                sys.stdout.flush()
+
+    elapsed = time.perf_counter() - start
+    print(f"{total} partidas en {elapsed:.1f} s con {args.jobs} procesos ({total / elapsed:.0f} partidas/s)")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"rules": rules,
+                       "summary": {p: summarize(r) for p, r in results.items()},
+                       "sessions": results}, f)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+import math
+from OpenGL.GL import *
+import numpy as np
+from game.profiler import profiler
+from game.culling import bounding_sphere
+
+def enable_auto_texgen():
+    """Genera coordenadas de textura automáticamente (sphere map)."""
+    glEnable(GL_TEXTURE_GEN_S)
+    glEnable(GL_TEXTURE_GEN_T)
+    glTexGeni(GL_S, GL_TEXTURE_GEN_MODE, GL_SPHERE_MAP)
+    glTexGeni(GL_T, GL_TEXTURE_GEN_MODE, GL_SPHERE_MAP)
+
+def disable_auto_texgen():
+    glDisable(GL_TEXTURE_GEN_S)
+    glDisable(GL_TEXTURE_GEN_T)
+
+def _rotation(angle, x, y, z):
+    """Matriz 3x3 equivalente a glRotatef(angle, x, y, z)."""
+    a = math.radians(angle)
+    c, s = math.cos(a), math.sin(a)
+    n = math.sqrt(x*x + y*y + z*z)
+    x, y, z = x / n, y / n, z / n
+    return np.array([
+        [x*x*(1-c) + c,   x*y*(1-c) - z*s, x*z*(1-c) + y*s],
+        [y*x*(1-c) + z*s, y*y*(1-c) + c,   y*z*(1-c) - x*s],
+        [x*z*(1-c) - y*s, y*z*(1-c) + x*s, z*z*(1-c) + c],
+    ])
+
+class MeshBatch:
+    """
+    Dibuja todas las instancias de un modelo en una sola llamada.
+
+    Cada frame se fusionan los vértices de las instancias (posición + color)
+    en un buffer de streaming; la textura, el texgen y el color se fijan una
+    vez por lote en vez de una vez por entidad.
+    """
+
+    def __init__(self, mesh, y=0.5, scale=1.0, rotations=(), color=(1.0, 1.0, 1.0),
+                 texture=None, sphere_map=False):
+        # Transformación fija del tipo (glRotatef... glScalef) aplicada una sola vez
+        m = np.eye(3)
+        for rot in rotations:
+            m = m @ _rotation(*rot)
+        m = m * scale
+        self.local = np.ascontiguousarray(mesh.positions @ m.T.astype(np.float32), dtype=np.float32)
+        self.bounds = bounding_sphere(self.local)  # (centro, radio) relativo a (x, y, z)
+        # Normal por defecto (0, 0, 1) rotada como lo haría la modelview (para el sphere map)
+        self.normal = tuple(np.linalg.inv(m).T @ np.array([0.0, 0.0, 1.0]))
+        self.mesh_indices = mesh.indices
+        self.y = y
+        self.color = color
+        self.texture = texture
+        self.sphere_map = sphere_map
+
+        self.capacity = 0
+        self.vbo = self.cbo = self.ibo = None
+        self.indices = None
+
+    def _reserve(self, n):
+        """Asegura un índice estático para n instancias (crece al doble)."""
+        if n <= self.capacity:
+            return
+        self.capacity = max(n, self.capacity * 2, 16)
+        stride = np.arange(self.capacity, dtype=np.uint32) * len(self.local)
+        self.indices = np.ascontiguousarray((self.mesh_indices[None, :] + stride[:, None]).ravel())
+        if bool(glGenBuffers):
+            if self.vbo is None:
+                self.vbo, self.cbo, self.ibo = glGenBuffers(3)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ibo)
+            glBufferData(GL_ELEMENT_ARRAY_BUFFER, self.indices.nbytes, self.indices, GL_STATIC_DRAW)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+
+    def _stream(self, buffer, data):
+        """Sube datos por frame; sin VBOs devuelve el propio array (client-side)."""
+        if buffer is None:
+            return data
+        glBindBuffer(GL_ARRAY_BUFFER, buffer)
+        glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_STREAM_DRAW)
+        return None
+
+    def split(self, xs, zs, colors=None):
+        """Grupos (lote, xs, zs, colors) a dibujar; un MeshBatch es un solo grupo."""
+        yield self, xs, zs, colors
+
+    def draw(self, xs, zs, colors=None):
+        """xs/zs: posiciones de las instancias vivas; colors: (n, 3) opcional por instancia."""
+        n = len(xs)
+        if n == 0:
+            return
+        self._reserve(n)
+
+        offsets = np.empty((n, 1, 3), dtype=np.float32)
+        offsets[:, 0, 0] = xs
+        offsets[:, 0, 1] = self.y
+        offsets[:, 0, 2] = zs
+        verts = (self.local[None, :, :] + offsets).reshape(-1, 3)
+
+        if self.texture is not None:
+            glEnable(GL_TEXTURE_2D)
+            glBindTexture(GL_TEXTURE_2D, self.texture)
+            if self.sphere_map:
+                enable_auto_texgen()
+
+        glNormal3fv(self.normal)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, self._stream(self.vbo, verts))
+        if colors is not None:
+            per_vertex = np.ascontiguousarray(np.repeat(np.asarray(colors, dtype=np.float32), len(self.local), axis=0))
+            glEnableClientState(GL_COLOR_ARRAY)
+            glColorPointer(3, GL_FLOAT, 0, self._stream(self.cbo, per_vertex))
+        else:
+            glColor3f(*self.color)
+
+        count = n * len(self.mesh_indices)
+        profiler.count_draw(count)
+        if self.ibo is not None:
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ibo)
+            glDrawElements(GL_TRIANGLES, count, GL_UNSIGNED_INT, None)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+        else:
+            glDrawElements(GL_TRIANGLES, count, GL_UNSIGNED_INT, self.indices)
+
+        if colors is not None:
+            glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+        if self.texture is not None:
+            if self.sphere_map:
+                disable_auto_texgen()
+            glBindTexture(GL_TEXTURE_2D, 0)
+            glDisable(GL_TEXTURE_2D)
+
+class LodBatch:
+    """
+    Un MeshBatch por nivel de detalle (ver game.mesh.lod_chain).
+
+    Cada instancia usa el nivel que le toca por su distancia a la cámara en
+    z: ``distances[i]`` es donde empieza el nivel i + 1. Los parámetros de
+    transformación, color y textura son los mismos para todos los niveles.
+    """
+
+    def __init__(self, meshes, distances, camera_z=5.0, **kwargs):
+        self.levels = [MeshBatch(mesh, **kwargs) for mesh in meshes]
+        self.y = self.levels[0].y
+        self.bounds = self.levels[0].bounds
+        self.distances = np.asarray(distances[:len(meshes) - 1], dtype=np.float32)
+        self.camera_z = camera_z
+
+    def split(self, xs, zs, colors=None):
+        if len(self.levels) == 1:
+            yield self.levels[0], xs, zs, colors
+            return
+        level = np.searchsorted(self.distances, self.camera_z - np.asarray(zs), side="right")
+        for i, batch in enumerate(self.levels):
+            mask = level == i
+            if mask.any():
+                yield batch, xs[mask], zs[mask], None if colors is None else colors[mask]
+
+    def draw(self, xs, zs, colors=None):
+        for batch, lxs, lzs, lcolors in self.split(xs, zs, colors):
+            batch.draw(lxs, lzs, lcolors)
@@ -0,0 +1,63 @@
+import numpy as np
+from game.profiler import profiler
+from game.renderer import perspective, translation, FOV, NEAR, FAR, EYE
+
+def bounding_sphere(positions):
+    """(centro, radio) que envuelve los vértices: centro de la caja y el vértice más lejano."""
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+    center = (positions.min(axis=0) + positions.max(axis=0)) / 2.0
+    radius = float(np.sqrt(((positions - center) ** 2).sum(axis=1).max()))
+    return center, radius
+
+class Frustum:
+    """
+    Los seis planos de la cámara del juego, en coordenadas de mundo.
+
+    Los planos se sacan de la matriz proyección * vista (Gribb/Hartmann) y se
+    normalizan, así que la distancia de un punto a cada plano sale con un
+    producto escalar y las esferas se prueban todas a la vez con NumPy.
+    """
+
+    def __init__(self, aspect, fov=FOV, near=NEAR, far=FAR, eye=EYE):
+        m = perspective(fov, aspect, near, far) @ translation(*eye)
+        planes = np.array([
+            m[3] + m[0], m[3] - m[0],  # izquierda, derecha
+            m[3] + m[1], m[3] - m[1],  # abajo, arriba
+            m[3] + m[2], m[3] - m[2],  # cerca, lejos
+        ], dtype=np.float32)
+        planes /= np.linalg.norm(planes[:, :3], axis=1)[:, None]
+        self.normals = np.ascontiguousarray(planes[:, :3])
+        self.offsets = planes[:, 3]
+
+    def spheres_visible(self, centers, radius):
+        """Máscara de las esferas (n, 3) que tocan el frustum."""
+        distances = centers @ self.normals.T + self.offsets
+        return (distances >= -radius).all(axis=1)
+
+    def cull_batch(self, batch, xs, zs, colors=None):
+        """Deja solo las instancias visibles del lote; las descartadas se cuentan en el profiler."""
+        n = len(xs)
+        if n == 0:
+            return xs, zs, colors
+        center, radius = batch.bounds
+        centers = np.empty((n, 3), dtype=np.float32)
+        centers[:, 0] = xs
+        centers[:, 0] += center[0]
+        centers[:, 1] = batch.y + center[1]
+        centers[:, 2] = zs
+        centers[:, 2] += center[2]
+        visible = self.spheres_visible(centers, radius)
+        culled = n - int(np.count_nonzero(visible))
+        profiler.count("culled_entities", culled)
+        if culled == 0:
+            return xs, zs, colors
+        return xs[visible], zs[visible], None if colors is None else colors[visible]
+
+    def cull_points(self, pos, color):
+        """Partículas visibles (pos y color filtrados)."""
+        visible = self.spheres_visible(pos, 0.0)
+        culled = len(pos) - int(np.count_nonzero(visible))
+        profiler.count("culled_particles", culled)
+        if culled == 0:
+            return pos, color
+        return pos[visible], color[visible]
@@ -0,0 +1,188 @@
+import numpy as np
+from game.conejo import Conejo
+from game.gnomo import Gnomo
+from game.piedra import Piedra
+from game.powerup import PowerUp
+from game.spawner import LANES
+
+# Tipos de entidad (índices en las tablas de abajo)
+CONEJO, GNOMO, PIEDRA, HEART, SHIELD = range(5)
+POWERUP_KINDS = {"heart": HEART, "shield": SHIELD}
+
+# Ventana de colisión por tipo: z_min <= z < z_max en el carril del jugador
+HIT_Z_MIN   = np.array([-1.0, -1.0, -1.0, -1.5, -1.5])
+HIT_Z_MAX   = np.array([np.inf, np.inf, np.inf, 0.5, 0.5])
+WINDOW_Z = float(HIT_Z_MIN.min())  # más lejos que esto nada puede chocar
+
+# Color por tipo (para los lotes con color por instancia)
+COLORS = np.array([Conejo.COLOR, Gnomo.COLOR, Piedra.COLOR,
+                   PowerUp.COLORS["heart"], PowerUp.COLORS["shield"]], dtype=np.float32)
+
+CULL_Z = 5  # detrás de la cámara: se descarta
+
+class Lane:
+    """
+    Cola de las entidades de un carril ordenadas por z, de la más cercana
+    al jugador (head) a la más lejana (tail).
+
+    Como todas avanzan a la misma velocidad el orden no cambia nunca: las
+    nuevas entran por el final y las que pasan la cámara salen por el
+    principio. Los datos viven en arrays entre head y tail.
+    """
+
+    def __init__(self, x, capacity=32):
+        self.x = float(x)
+        self.z = np.zeros(capacity)
+        self.prev_z = np.zeros(capacity)  # z al inicio del último paso (interpolación)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.head = 0
+        self.tail = 0
+
+    def __len__(self):
+        return self.tail - self.head
+
+    def _make_room(self):
+        """Hace lugar al final: corre los datos al principio o duplica la capacidad."""
+        n = len(self)
+        capacity = len(self.z) if self.head >= n else len(self.z) * 2
+        for name in ("z", "prev_z", "kind"):
+            old = getattr(self, name)
+            new = old if capacity == len(old) else np.zeros(capacity, dtype=old.dtype)
+            new[:n] = old[self.head:self.tail]
+            setattr(self, name, new)
+        self.head, self.tail = 0, n
+
+    def push(self, kind, z):
+        if self.tail == len(self.z):
+            self._make_room()
+        # Casi siempre es la más lejana; si no, se inserta en su lugar
+        i = self.tail
+        while i > self.head and self.z[i - 1] < z:
+            i -= 1
+        for arr in (self.z, self.prev_z, self.kind):
+            arr[i + 1:self.tail + 1] = arr[i:self.tail]
+        self.z[i] = z
+        self.prev_z[i] = z
+        self.kind[i] = kind
+        self.tail += 1
+
+    def remove(self, indices):
+        """Quita las posiciones dadas (todas cerca de head) corriendo las anteriores hacia atrás."""
+        removed = set(indices)
+        write = max(indices) + 1
+        for i in range(write - 1, self.head - 1, -1):
+            if i not in removed:
+                write -= 1
+                self.z[write] = self.z[i]
+                self.prev_z[write] = self.prev_z[i]
+                self.kind[write] = self.kind[i]
+        self.head = write
+
+class EntityStore:
+    """
+    Entidades del carril, agrupadas por carril (x) en colas ordenadas por z.
+
+    Avanzar es una operación vectorizada por carril; las colisiones solo
+    miran el principio de la cola del carril del jugador y el descarte solo
+    saca del principio de cada cola, así que ninguna de las dos depende de
+    cuántas entidades esperan más lejos.
+    """
+
+    def __init__(self, lanes=LANES):
+        self.lanes = {x: Lane(x) for x in lanes}
+
+    def __len__(self):
+        return sum(len(lane) for lane in self.lanes.values())
+
+    def spawn(self, kind, x, z):
+        lane = self.lanes.get(x)
+        if lane is None:
+            lane = self.lanes[x] = Lane(x)
+        lane.push(kind, z)
+
+    def add_wave(self, conejos, gnomos, piedras, powerups):
+        """Agrega las entidades de generate_wave."""
+        for c in conejos:
+            self.spawn(CONEJO, c.x, c.z)
+        for g in gnomos:
+            self.spawn(GNOMO, g.x, g.z)
+        for p in piedras:
+            self.spawn(PIEDRA, p.x, p.z)
+        for pu in powerups:
+            self.spawn(POWERUP_KINDS[pu.kind], pu.x, pu.z)
+
+    def advance(self, speed):
+        for lane in self.lanes.values():
+            h, t = lane.head, lane.tail
+            lane.prev_z[h:t] = lane.z[h:t]
+            lane.z[h:t] += speed
+
+    def collide(self, player_x):
+        """
+        Quita y devuelve las entidades del carril del jugador que atravesaron
+        su ventana de colisión durante el último paso (de prev_z a z), así un
+        paso largo no se la salta. Los choques son tuplas (kind, x, z),
+        ordenados por tipo.
+        """
+        lane = self.lanes.get(player_x)
+        if lane is None:
+            return ()
+        hits = []
+        hit_indices = []
+        i = lane.head
+        while i < lane.tail and lane.z[i] >= WINDOW_Z:
+            kind = int(lane.kind[i])
+            if lane.z[i] >= HIT_Z_MIN[kind] and lane.prev_z[i] < HIT_Z_MAX[kind]:
+                hits.append((kind, lane.x, float(lane.z[i])))
+                hit_indices.append(i)
+            i += 1
+        if not hits:
+            return ()
+        lane.remove(hit_indices)
+        hits.sort(key=lambda hit: hit[0])
+        return hits
+
+    def cull(self, limit=CULL_Z):
+        """Saca de cada cola las entidades que ya quedaron detrás de la cámara."""
+        for lane in self.lanes.values():
+            while lane.head < lane.tail and lane.z[lane.head] >= limit:
+                lane.head += 1
+            if lane.head == lane.tail:
+                lane.head = lane.tail = 0
+
+    def nearest(self, x, max_z=np.inf):
+        """(kind, z) de la entidad más cercana del carril x con z < max_z, o None."""
+        lane = self.lanes.get(x)
+        if lane is None:
+            return None
+        for i in range(lane.head, lane.tail):
+            if lane.z[i] < max_z:
+                return int(lane.kind[i]), float(lane.z[i])
+        return None
+
+    def min_z(self):
+        """z de la entidad más lejana (inf si no hay ninguna)."""
+        return min((lane.z[lane.tail - 1] for lane in self.lanes.values() if len(lane)), default=np.inf)
+
+    def positions(self, *kinds, alpha=1.0):
+        """
+        (xs, zs, kinds) de las entidades de los tipos dados; con alpha < 1
+        la z se interpola entre el paso anterior y el actual.
+        """
+        xs, zs, ks = [], [], []
+        for lane in self.lanes.values():
+            h, t = lane.head, lane.tail
+            if h == t:
+                continue
+            kind = lane.kind[h:t]
+            mask = np.isin(kind, kinds)
+            z = lane.z[h:t][mask]
+            if alpha < 1.0:
+                prev = lane.prev_z[h:t][mask]
+                z = prev + (z - prev) * alpha
+            xs.append(np.full(len(z), lane.x))
+            zs.append(z)
+            ks.append(kind[mask])
+        if not xs:
+            return np.zeros(0), np.zeros(0), np.zeros(0, dtype=np.int8)
+        return np.concatenate(xs), np.concatenate(zs), np.concatenate(ks)
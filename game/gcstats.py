@@ -0,0 +1,77 @@
+import gc
+import sys
+import time
+from game.profiler import profiler
+
+class GCMonitor:
+    """
+    Mide las pausas del recolector cíclico y lo controla durante el juego.
+
+    Cada pausa se suma al profiler como la fase "gc" y cada frame registra
+    cuántos bloques de memoria se reservaron netos ("alloc_blocks"), para
+    comprobar que el juego en régimen estable no reserva memoria.
+
+    Modos de gameplay_begin(): "freeze" mueve todo lo cargado a la generación
+    permanente (las colecciones solo recorren objetos nuevos); "disable"
+    además apaga el GC hasta gameplay_end().
+    """
+
+    def __init__(self):
+        self.collections = [0, 0, 0]
+        self.pause_ms = 0.0
+        self.max_pause_ms = 0.0
+        self.mode = None
+        self._start = None
+        self._blocks = sys.getallocatedblocks()
+
+    def install(self):
+        if self._callback not in gc.callbacks:
+            gc.callbacks.append(self._callback)
+
+    def uninstall(self):
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+
+    def _callback(self, phase, info):
+        if phase == "start":
+            self._start = time.perf_counter()
+        elif self._start is not None:
+            ms = (time.perf_counter() - self._start) * 1000
+            self._start = None
+            self.collections[info["generation"]] += 1
+            self.pause_ms += ms
+            self.max_pause_ms = max(self.max_pause_ms, ms)
+            profiler.add_time("gc", ms)
+
+    def gameplay_begin(self, mode="freeze"):
+        self.mode = mode
+        if mode in ("freeze", "disable"):
+            gc.collect()
+            gc.freeze()
+        if mode == "disable":
+            gc.disable()
+        self._blocks = sys.getallocatedblocks()
+
+    def gameplay_end(self):
+        if self.mode == "disable":
+            gc.enable()
+        if self.mode in ("freeze", "disable"):
+            gc.unfreeze()
+        self.mode = None
+
+    def sample_frame(self):
+        """Bloques reservados (netos) desde el frame anterior; se registra en el profiler."""
+        blocks = sys.getallocatedblocks()
+        delta = blocks - self._blocks
+        self._blocks = blocks
+        profiler.count("alloc_blocks", delta)
+        return delta
+
+    def stats(self):
+        return {
+            "collections": list(self.collections),
+            "pause_ms": self.pause_ms,
+            "max_pause_ms": self.max_pause_ms,
+            "pending": gc.get_count(),  # asignaciones por generación desde la última colección
+            "frozen_objects": gc.get_freeze_count(),
+        }
@@ -0,0 +1,74 @@
+from OpenGL.GL import *
+import numpy as np
+from game.utils import triangulate
+from game.model_cache import load_model_cached
+from game.meshopt import build_lods, LOD_RATIOS
+from game.profiler import profiler
+
+class Mesh:
+    """Modelo residente en GPU: se sube una sola vez y se dibuja con una llamada."""
+
+    def __init__(self, positions, indices):
+        self.positions = np.ascontiguousarray(positions, dtype=np.float32).reshape(-1, 3)
+        self.indices = np.ascontiguousarray(indices, dtype=np.uint32).reshape(-1)
+        self.count = len(self.indices)
+        self.vbo = None
+        self.ibo = None
+        self.display_list = None
+
+    def upload(self):
+        """Sube el modelo a un VBO/IBO; si el driver no tiene VBOs usa una display list."""
+        if bool(glGenBuffers):
+            self.vbo, self.ibo = glGenBuffers(2)
+            glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+            glBufferData(GL_ARRAY_BUFFER, self.positions.nbytes, self.positions, GL_STATIC_DRAW)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ibo)
+            glBufferData(GL_ELEMENT_ARRAY_BUFFER, self.indices.nbytes, self.indices, GL_STATIC_DRAW)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        else:
+            self.display_list = glGenLists(1)
+            glNewList(self.display_list, GL_COMPILE)
+            glBegin(GL_TRIANGLES)
+            for vi in self.indices:
+                glVertex3fv(self.positions[vi])
+            glEnd()
+            glEndList()
+
+    def draw(self):
+        if self.vbo is None and self.display_list is None:
+            self.upload()
+        profiler.count_draw(self.count)
+        if self.display_list is not None:
+            glCallList(self.display_list)
+            return
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glVertexPointer(3, GL_FLOAT, 0, None)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ibo)
+        glDrawElements(GL_TRIANGLES, self.count, GL_UNSIGNED_INT, None)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def delete(self):
+        if self.vbo is not None:
+            glDeleteBuffers(2, [self.vbo, self.ibo])
+            self.vbo = self.ibo = None
+        if self.display_list is not None:
+            glDeleteLists(self.display_list, 1)
+            self.display_list = None
+
+def load_mesh(filepath):
+    return Mesh(*load_model_cached(filepath))
+
+def lod_chain(mesh, ratios=LOD_RATIOS):
+    """[mesh, LOD1, LOD2, ...] de mayor a menor detalle; solo [mesh] si es demasiado simple."""
+    return [mesh] + [Mesh(p, i) for p, i in build_lods(mesh.positions, mesh.indices, ratios)]
+
+def cube_mesh(size=1.0):
+    """Cubo unitario centrado en el origen (power-ups)."""
+    h = size / 2.0
+    positions = [(x, y, z) for x in (-h, h) for y in (-h, h) for z in (-h, h)]
+    quads = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+    return Mesh(positions, triangulate(quads))
@@ -0,0 +1,200 @@
+"""
+Procesado de mallas al construir la cache: soldado de vértices, orden de
+índices para la cache de vértices de la GPU y niveles de detalle (LOD).
+
+Todas las funciones reciben y devuelven (posiciones (N, 3) float32,
+índices uint32 planos de triángulos).
+
+Uso: python -m game.meshopt models/*.obj   (ACMR antes/después y tamaños de LOD)
+"""
+import sys
+import numpy as np
+
+CACHE_SIZE = 32          # cache de vértices modelada por el optimizador
+LOD_RATIOS = (0.5, 0.2)  # triángulos de cada LOD respecto al original
+LOD_MIN_TRIANGLES = 64   # por debajo no vale la pena simplificar
+
+def _arrays(positions, indices):
+    return (np.ascontiguousarray(positions, dtype=np.float32).reshape(-1, 3),
+            np.ascontiguousarray(indices, dtype=np.uint32).reshape(-1))
+
+def remove_degenerate(tris):
+    """Quita triángulos con vértices repetidos; tris es (T, 3)."""
+    keep = (tris[:, 0] != tris[:, 1]) & (tris[:, 1] != tris[:, 2]) & (tris[:, 0] != tris[:, 2])
+    return tris[keep]
+
+def weld(positions, indices, tolerance=1e-6):
+    """Une los vértices con la misma posición (dentro de la tolerancia)."""
+    positions, indices = _arrays(positions, indices)
+    keys = np.round(positions / tolerance).astype(np.int64)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    tris = remove_degenerate(inverse.reshape(-1)[indices].reshape(-1, 3))
+    return positions[first], tris.astype(np.uint32).reshape(-1)
+
+def optimize_vertex_fetch(positions, indices):
+    """Renumera los vértices en orden de primer uso (y descarta los que no se usan)."""
+    positions, indices = _arrays(positions, indices)
+    order = np.unique(indices, return_index=True)[1]
+    used = indices[np.sort(order)]
+    remap = np.zeros(len(positions), dtype=np.uint32)
+    remap[used] = np.arange(len(used), dtype=np.uint32)
+    return positions[used], remap[indices]
+
+def _vertex_score(cache_pos, valence):
+    """Puntuación de Forsyth: premia vértices recién usados y con pocos triángulos pendientes."""
+    if valence == 0:
+        return -1.0
+    score = 0.0
+    if cache_pos >= 0:
+        if cache_pos < 3:
+            score = 0.75  # los del último triángulo no se premian de más
+        else:
+            score = (1.0 - (cache_pos - 3) / (CACHE_SIZE - 3)) ** 1.5
+    return score + 2.0 * valence ** -0.5
+
+def optimize_vertex_cache(indices, vertex_count=None):
+    """
+    Reordena los triángulos para aprovechar la cache de vértices
+    (algoritmo de Tom Forsyth, "Linear-Speed Vertex Cache Optimisation").
+    """
+    indices = np.ascontiguousarray(indices, dtype=np.uint32).reshape(-1)
+    tris = indices.reshape(-1, 3).tolist()
+    n_tris = len(tris)
+    if vertex_count is None:
+        vertex_count = int(indices.max()) + 1 if n_tris else 0
+
+    adjacency = [[] for _ in range(vertex_count)]
+    for t, tri in enumerate(tris):
+        for v in tri:
+            adjacency[v].append(t)
+    valence = [len(a) for a in adjacency]
+    vertex_score = [_vertex_score(-1, valence[v]) for v in range(vertex_count)]
+    tri_score = [sum(vertex_score[v] for v in tri) for tri in tris]
+    added = [False] * n_tris
+
+    out = []
+    cache = []
+    best = max(range(n_tris), key=tri_score.__getitem__) if n_tris else -1
+    scan = 0  # siguiente triángulo a revisar cuando la cache no da candidatos
+    while best >= 0:
+        added[best] = True
+        tri = tris[best]
+        out.extend(tri)
+        for v in tri:
+            valence[v] -= 1
+            adjacency[v].remove(best)
+            if v in cache:
+                cache.remove(v)
+        cache = tri + cache
+        evicted = cache[CACHE_SIZE:]
+        del cache[CACHE_SIZE:]
+
+        # Se recalculan solo los vértices que se movieron en la cache
+        touched = set()
+        for pos, v in enumerate(cache):
+            vertex_score[v] = _vertex_score(pos, valence[v])
+            touched.update(adjacency[v])
+        for v in evicted:
+            vertex_score[v] = _vertex_score(-1, valence[v])
+            touched.update(adjacency[v])
+
+        best, best_score = -1, -1.0
+        for t in touched:
+            s = tri_score[t] = sum(vertex_score[v] for v in tris[t])
+            if s > best_score:
+                best, best_score = t, s
+        if best < 0:
+            while scan < n_tris and added[scan]:
+                scan += 1
+            best = scan if scan < n_tris else -1
+    return np.asarray(out, dtype=np.uint32)
+
+def acmr(indices, cache_size=16):
+    """Fallos por triángulo de una cache FIFO de vértices (3.0 = sin reutilización)."""
+    indices = np.asarray(indices).reshape(-1)
+    if len(indices) == 0:
+        return 0.0
+    cache = []
+    misses = 0
+    for v in indices.tolist():
+        if v not in cache:
+            misses += 1
+            cache.append(v)
+            if len(cache) > cache_size:
+                cache.pop(0)
+    return misses / (len(indices) // 3)
+
+def optimize(positions, indices):
+    """Soldado + orden para la cache de vértices + orden de lectura de vértices."""
+    positions, indices = weld(positions, indices)
+    indices = optimize_vertex_cache(indices, len(positions))
+    return optimize_vertex_fetch(positions, indices)
+
+def cluster(positions, indices, cells):
+    """
+    Simplifica agrupando vértices en una rejilla de ``cells`` celdas en el eje
+    más largo: cada celda se reduce a la media de sus vértices.
+    """
+    positions, indices = _arrays(positions, indices)
+    lo = positions.min(axis=0)
+    size = max(float((positions.max(axis=0) - lo).max()), 1e-9) / cells
+    cell = np.minimum(((positions - lo) / size).astype(np.int64), cells - 1)
+    _, inverse = np.unique(cell, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    counts = np.bincount(inverse).astype(np.float32)
+    merged = np.zeros((len(counts), 3), dtype=np.float32)
+    np.add.at(merged, inverse, positions)
+    merged /= counts[:, None]
+
+    tris = remove_degenerate(inverse[indices].reshape(-1, 3))
+    # Dos triángulos que colapsan a los mismos vértices se dibujan una vez
+    _, first = np.unique(np.sort(tris, axis=1), axis=0, return_index=True)
+    tris = tris[np.sort(first)]
+    return optimize_vertex_fetch(merged, tris.astype(np.uint32).reshape(-1))
+
+def simplify(positions, indices, ratio):
+    """Busca la rejilla cuyo resultado tiene más triángulos sin pasar de ``ratio``."""
+    positions, indices = _arrays(positions, indices)
+    target = ratio * (len(indices) // 3)
+    lo, hi = 1, 256
+    best = None
+    while lo <= hi:
+        cells = (lo + hi) // 2
+        result = cluster(positions, indices, cells)
+        if len(result[1]) // 3 <= target:
+            best = result
+            lo = cells + 1
+        else:
+            hi = cells - 1
+    return best
+
+def build_lods(positions, indices, ratios=LOD_RATIOS):
+    """Niveles simplificados (ya optimizados) de mayor a menor detalle; [] si la malla es pequeña."""
+    positions, indices = _arrays(positions, indices)
+    if len(indices) // 3 < LOD_MIN_TRIANGLES:
+        return []
+    lods = []
+    for ratio in ratios:
+        result = simplify(positions, indices, ratio)
+        if result is None or len(result[1]) == 0:
+            break
+        lod_positions, lod_indices = result
+        lods.append(optimize_vertex_fetch(lod_positions,
+                                          optimize_vertex_cache(lod_indices, len(lod_positions))))
+    return lods
+
+def main(paths):
+    from game.obj import parse_obj
+    for filepath in paths:
+        vertices, indices, _ = parse_obj(filepath)
+        positions = vertices[:, :3]  # como la cache de modelos
+        opt_positions, opt_indices = optimize(positions, indices)
+        print(f"{filepath}: {len(indices) // 3} triángulos, "
+              f"{len(positions)} -> {len(opt_positions)} vértices, "
+              f"ACMR {acmr(indices):.3f} -> {acmr(opt_indices):.3f}")
+        for i, (lod_positions, lod_indices) in enumerate(build_lods(opt_positions, opt_indices), 1):
+            print(f"    LOD{i}: {len(lod_indices) // 3} triángulos, {len(lod_positions)} vértices, "
+                  f"ACMR {acmr(lod_indices):.3f}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
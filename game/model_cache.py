@@ -0,0 +1,134 @@
+"""
+Cache binaria de modelos (OBJ o STL) ya procesados.
+
+Los dos formatos terminan en el mismo Mesh: junto a cada modelo se guarda
+un archivo ``<modelo>.cache`` con una cabecera y los arrays crudos
+little-endian (posiciones float32 e índices de triángulos uint32), ya
+soldados y reordenados para la cache de vértices (game.meshopt). Solo se
+guardan las posiciones: ningún backend dibuja normales ni uvs de los
+modelos, y un OBJ con normales por cara separaría cada esquina en su
+propio vértice. La cache se valida con el mtime/tamaño del modelo y, si no
+coinciden, con su hash; si está vieja o no existe se reconstruye sola. Los
+arrays se cargan con ``numpy.memmap`` y se pasan tal cual al Mesh (sin copias).
+
+Uso: python -m game.model_cache models/*.obj models/*.stl   (mide carga en frío y en caliente)
+"""
+import hashlib
+import os
+import struct
+import sys
+import time
+import numpy as np
+from game.obj import parse_obj
+from game.stl import parse_stl
+from game.meshopt import optimize
+
+MAGIC = b"LMMC"
+VERSION = 5
+# magic, versión, mtime del modelo, tamaño del modelo, sha1 del modelo, nº vértices, nº índices
+HEADER = struct.Struct("<4sIdQ20sII")
+HEADER_SIZE = 64  # la cabecera se rellena hasta 64 bytes para alinear los datos
+
+POSITION_DTYPE = np.dtype("<f4")
+INDEX_DTYPE = np.dtype("<u4")
+
+# Lector de cada formato: ruta -> (vértices, índices, layout)
+PARSERS = {
+    ".obj": parse_obj,
+    ".stl": parse_stl,
+}
+
+# Últimos tiempos de carga: ruta -> (segundos, "cold" | "warm")
+load_stats = {}
+
+def cache_path(filepath):
+    return filepath + ".cache"
+
+def _hash_file(filepath):
+    with open(filepath, "rb") as f:
+        return hashlib.sha1(f.read()).digest()
+
+def _read_header(path):
+    try:
+        with open(path, "rb") as f:
+            raw = f.read(HEADER.size)
+    except OSError:
+        return None
+    if len(raw) != HEADER.size:
+        return None
+    header = HEADER.unpack(raw)
+    if header[0] != MAGIC or header[1] != VERSION:
+        return None
+    return header
+
+def build_cache(filepath):
+    """Parsea y optimiza el modelo y escribe la cache; devuelve (posiciones, índices) en memoria."""
+    parser = PARSERS.get(os.path.splitext(filepath)[1].lower())
+    if parser is None:
+        raise ValueError(f"{filepath}: formato de modelo no soportado")
+    vertices, indices, _ = parser(filepath)
+    positions, indices = optimize(vertices[:, :3], indices)
+    positions = positions.astype(POSITION_DTYPE, copy=False)
+    indices = indices.astype(INDEX_DTYPE, copy=False)
+
+    st = os.stat(filepath)
+    header = HEADER.pack(MAGIC, VERSION, st.st_mtime, st.st_size, _hash_file(filepath),
+                         len(positions), len(indices))
+    path = cache_path(filepath)
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(header.ljust(HEADER_SIZE, b"\0"))
+            f.write(positions.tobytes())
+            f.write(indices.tobytes())
+        os.replace(tmp, path)
+    except OSError:
+        pass  # sin permisos de escritura: se usa lo parseado sin cachear
+    return positions, indices
+
+def _is_fresh(filepath, header):
+    st = os.stat(filepath)
+    if header[2] == st.st_mtime and header[3] == st.st_size:
+        return True
+    # mtime distinto (p. ej. tras un checkout): decide el hash del contenido
+    if header[4] != _hash_file(filepath):
+        return False
+    try:
+        with open(cache_path(filepath), "r+b") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, st.st_mtime, st.st_size, *header[4:]))
+    except OSError:
+        pass
+    return True
+
+def load_model_cached(filepath):
+    """(posiciones (N, 3) float32, índices uint32) desde la cache, reconstruyéndola si hace falta."""
+    start = time.perf_counter()
+    path = cache_path(filepath)
+    header = _read_header(path)
+    if header is not None and _is_fresh(filepath, header):
+        n_vertices, n_indices = header[5], header[6]
+        positions = np.memmap(path, dtype=POSITION_DTYPE, mode="r", offset=HEADER_SIZE,
+                              shape=(n_vertices, 3))
+        indices = np.memmap(path, dtype=INDEX_DTYPE, mode="r",
+                            offset=HEADER_SIZE + positions.nbytes, shape=(n_indices,))
+        kind = "warm"
+    else:
+        positions, indices = build_cache(filepath)
+        kind = "cold"
+    load_stats[filepath] = (time.perf_counter() - start, kind)
+    return positions, indices
+
+def main(paths):
+    for filepath in paths:
+        try:
+            os.remove(cache_path(filepath))
+        except OSError:
+            pass
+        load_model_cached(filepath)
+        cold, _ = load_stats[filepath]
+        load_model_cached(filepath)
+        warm, _ = load_stats[filepath]
+        print(f"{filepath}: frío {cold * 1000:.2f} ms, caliente {warm * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
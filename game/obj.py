@@ -0,0 +1,142 @@
+"""
+Lector de OBJ vectorizado.
+
+El archivo se lee de una vez; los inicios de línea salen de un array de
+bytes, las líneas de cada tipo de registro (v, vn, vt, f) se copian por
+tramos y NumPy convierte todos sus números en una sola llamada, sin
+recorrer las líneas en Python. Las caras (triángulos, quads o n-gons)
+se triangulan en abanico y cada combinación distinta posición/normal/uv
+de las esquinas es un vértice del array intercalado: posición, normal
+si el layout tiene NORMAL y uv si tiene TEXCOORD. La cache de modelos
+(game.model_cache) se queda solo con las posiciones.
+
+Los índices negativos (relativos) se resuelven contra el total de
+vértices del archivo, lo que es correcto cuando las caras van al final.
+"""
+import numpy as np
+
+# Atributos opcionales detrás de la posición en los vértices intercalados
+NORMAL, TEXCOORD = 1, 2
+
+SPACE, TAB, CR, NL, SLASH = b" \t\r\n/"
+
+class _Lines:
+    """El archivo entero con el inicio y el final de cada línea."""
+
+    def __init__(self, data):
+        self.data = data if data.endswith(b"\n") else data + b"\n"
+        self.bytes = np.frombuffer(self.data, dtype=np.uint8)
+        self.ends = np.flatnonzero(self.bytes == NL)
+        self.starts = np.concatenate(([0], self.ends[:-1] + 1))
+
+    def records(self, keyword):
+        """(texto de las líneas ``keyword ...`` sin la palabra clave, nº de líneas)."""
+        k = len(keyword)
+        last = len(self.bytes) - 1
+        lines = self.ends - self.starts > k
+        for column, char in enumerate(keyword):
+            lines &= self.bytes[np.minimum(self.starts + column, last)] == char
+        after = self.bytes[np.minimum(self.starts + k, last)]
+        lines &= (after == SPACE) | (after == TAB)
+        # La palabra clave se borra y las líneas de un mismo tipo, que suelen ir
+        # seguidas, se copian por tramos
+        buf = self.bytes.copy()
+        for column in range(k):
+            buf[self.starts[lines] + column] = SPACE
+        data = buf.data
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], lines.view(np.int8), [0]))))
+        text = b"".join([data[self.starts[a]:self.ends[b - 1] + 1]
+                         for a, b in zip(edges[::2].tolist(), edges[1::2].tolist())])
+        return text, int(np.count_nonzero(lines))
+
+def _tokens(text):
+    """(bytes, inicio de cada token, línea de cada token) de un texto terminado en salto de línea."""
+    buf = np.frombuffer(text, dtype=np.uint8)
+    blank = (buf == SPACE) | (buf == TAB) | (buf == CR) | (buf == NL)
+    starts = np.flatnonzero(~blank & np.concatenate(([True], blank[:-1])))
+    return buf, starts, np.searchsorted(np.flatnonzero(buf == NL), starts)
+
+def _floats(lines, keyword, columns):
+    """(n, columns) float32 con los primeros ``columns`` números de cada registro."""
+    text, count = lines.records(keyword)
+    values = np.fromstring(text, dtype=np.float32, sep=" ")
+    if len(values) == count * columns:
+        return values.reshape(-1, columns)
+    # Registros con más números (v x y z w, vt u v w...): se toman los primeros
+    per_line = np.bincount(_tokens(text)[2], minlength=count)
+    if (per_line < columns).any():
+        raise ValueError(f"registros '{keyword.decode()}' con menos de {columns} números")
+    first = np.cumsum(per_line) - per_line
+    return values[first[:, None] + np.arange(columns)]
+
+def _resolve(index, count):
+    """Índices OBJ (desde 1, negativos desde el final, 0 = ausente) a índices desde 0 (-1 = ausente)."""
+    return np.where(index > 0, index - 1, np.where(index < 0, count + index, -1))
+
+def _faces(lines):
+    """(v, vt, vn) de cada esquina (0 = ausente) y número de esquinas de cada cara."""
+    text, count = lines.records(b"f")
+    buf, corners, corner_line = _tokens(text)
+    counts = np.bincount(corner_line, minlength=count)
+    # Por esquina: v, v/vt, v//vn o v/vt/vn según sus barras y si hay dos seguidas
+    slashes = np.flatnonzero(buf == SLASH)
+    corner_of = np.searchsorted(corners, slashes, side="right") - 1
+    fields = 1 + np.bincount(corner_of, minlength=len(corners))
+    double = slashes[1:] == slashes[:-1] + 1
+    no_texcoord = np.zeros(len(corners), dtype=bool)
+    no_texcoord[corner_of[1:][double]] = True
+    numbers = fields - no_texcoord
+    buf = buf.copy()
+    buf[slashes] = SPACE
+    values = np.fromstring(buf.tobytes(), dtype=np.int64, sep=" ")
+    if len(values) != numbers.sum():
+        raise ValueError("caras con un formato que no se entiende")
+    first = np.cumsum(numbers) - numbers
+    last = len(values) - 1
+    v = values[first]
+    vt = np.where((fields >= 2) & ~no_texcoord, values[np.minimum(first + 1, last)], 0)
+    vn = np.where(fields >= 3, values[np.minimum(first + numbers - 1, last)], 0)
+    return v, vt, vn, counts
+
+def fan_triangles(counts):
+    """(T, 3) índices de esquina de los abanicos de caras con ``counts`` esquinas seguidas."""
+    counts = np.asarray(counts, dtype=np.int64)
+    first = np.cumsum(counts) - counts
+    fans = np.maximum(counts - 2, 0)
+    face = np.repeat(np.arange(len(counts)), fans)
+    step = np.arange(len(face)) - np.repeat(np.cumsum(fans) - fans, fans) + 1
+    base = first[face]
+    return np.stack([base, base + step, base + step + 1], axis=1)
+
+def parse_obj(filepath):
+    """(vértices (N, k) float32 intercalados, índices uint32 de triángulos, layout)."""
+    with open(filepath, "rb") as f:
+        lines = _Lines(f.read())
+    positions = _floats(lines, b"v", 3)
+    normals = _floats(lines, b"vn", 3)
+    texcoords = _floats(lines, b"vt", 2)
+    v, vt, vn, counts = _faces(lines)
+    v = _resolve(v, len(positions))
+    vt = _resolve(vt, len(texcoords))
+    vn = _resolve(vn, len(normals))
+
+    # Un atributo se guarda solo si todas las esquinas lo tienen
+    layout = 0
+    key = v
+    if len(normals) and (vn >= 0).all():
+        layout |= NORMAL
+        key = key * len(normals) + vn
+    if len(texcoords) and (vt >= 0).all():
+        layout |= TEXCOORD
+        key = key * len(texcoords) + vt
+    # Una clave entera por combinación (v, vn, vt): unique en 1D es mucho más rápido que por filas
+    _, first, inverse = np.unique(key, return_index=True, return_inverse=True)
+
+    parts = [positions[v[first]]]
+    if layout & NORMAL:
+        parts.append(normals[vn[first]])
+    if layout & TEXCOORD:
+        parts.append(texcoords[vt[first]])
+    vertices = np.ascontiguousarray(np.concatenate(parts, axis=1), dtype=np.float32)
+    indices = inverse.reshape(-1)[fan_triangles(counts)].astype(np.uint32).reshape(-1)
+    return vertices, indices, layout
@@ -0,0 +1,80 @@
+from OpenGL.GL import *
+import numpy as np
+from game.profiler import profiler
+
+def draw_points(pos, color, size=4):
+    """Dibuja puntos (n, 3) con su color (n, 3) en una llamada."""
+    if len(pos) == 0:
+        return
+    glPointSize(size)
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glEnableClientState(GL_COLOR_ARRAY)
+    glVertexPointer(3, GL_FLOAT, 0, pos)
+    glColorPointer(3, GL_FLOAT, 0, color)
+    glDrawArrays(GL_POINTS, 0, len(pos))
+    profiler.count_draw(len(pos))
+    glDisableClientState(GL_COLOR_ARRAY)
+    glDisableClientState(GL_VERTEX_ARRAY)
+
+class ParticlePool:
+    """
+    Todas las partículas del juego en arrays preasignados (buffer circular).
+
+    emit() escribe sobre los huecos más antiguos, así que una ráfaga nunca
+    reserva memoria; update() y draw() no recorren partículas en Python.
+    """
+
+    def __init__(self, capacity=1024, lifetime=30, seed=None):
+        self.capacity = capacity
+        self.lifetime = lifetime
+        self.pos = np.zeros((capacity, 3), dtype=np.float32)
+        self.vel = np.zeros((capacity, 3), dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.head = 0  # siguiente hueco a escribir (el más antiguo)
+        self.rng = np.random.default_rng(seed)
+        self._rand = np.zeros((capacity, 3), dtype=np.float32)
+
+    def emit(self, x, y, z, color, count=20):
+        count = min(count, self.capacity)
+        start, end = self.head, self.head + count
+        if end <= self.capacity:
+            self._write(slice(start, end), x, y, z, color)
+        else:
+            # Da la vuelta al buffer
+            end -= self.capacity
+            self._write(slice(start, self.capacity), x, y, z, color)
+            self._write(slice(0, end), x, y, z, color)
+        self.head = end % self.capacity
+
+    def _write(self, s, x, y, z, color):
+        n = s.stop - s.start
+        rand = self._rand[:n]
+        self.rng.random(dtype=np.float32, out=rand)
+        # vx, vz en [-0.1, 0.1); vy en [0.05, 0.2)
+        vel = self.vel[s]
+        vel[:, 0] = rand[:, 0] * 0.2 - 0.1
+        vel[:, 1] = rand[:, 1] * 0.15 + 0.05
+        vel[:, 2] = rand[:, 2] * 0.2 - 0.1
+        self.pos[s] = (x, y, z)
+        self.color[s] = color
+        self.life[s] = self.lifetime
+
+    def update(self):
+        self.pos += self.vel
+        self.vel[:, 1] -= 0.01
+        self.life -= 1
+
+    def kill(self):
+        self.life[:] = 0
+
+    def live_count(self):
+        return int(np.count_nonzero(self.life > 0))
+
+    def live(self):
+        """Posiciones y colores (contiguos) de las partículas vivas."""
+        live = self.life > 0
+        return np.ascontiguousarray(self.pos[live]), np.ascontiguousarray(self.color[live])
+
+    def draw(self):
+        draw_points(*self.live())
@@ -0,0 +1,38 @@
+from game.profiler import profiler
+
+class Pool:
+    """
+    Reutiliza instancias de una clase con __slots__ y reset().
+
+    acquire() devuelve una instancia libre reiniciada en el lugar (o crea una
+    si no hay); release() la devuelve. Las instancias nuevas se cuentan en el
+    profiler ("pool_new"), así que en régimen estable ese contador es 0.
+    """
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []
+        self.created = 0
+        self.acquired = 0
+        self.released = 0
+
+    def acquire(self, *args):
+        self.acquired += 1
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+            return obj
+        self.created += 1
+        profiler.count("pool_new")
+        return self.cls(*args)
+
+    def release(self, obj):
+        self.released += 1
+        self.free.append(obj)
+
+    @property
+    def in_use(self):
+        return self.acquired - self.released
+
+    def stats(self):
+        return {"created": self.created, "in_use": self.in_use, "free": len(self.free)}
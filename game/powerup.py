@@ -0,0 +1,11 @@
+class PowerUp:
+    COLORS = {"heart": (1.0, 0.2, 0.3), "shield": (0.2, 0.7, 1.0)}
+    __slots__ = ("kind", "x", "z")
+
+    def __init__(self, kind, lane, z):
+        self.reset(kind, lane, z)
+
+    def reset(self, kind, lane, z):
+        self.kind = kind
+        self.x = lane
+        self.z = z
@@ -0,0 +1,92 @@
+import csv
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+
+class FrameProfiler:
+    """
+    Tiempos por fase y contadores por frame.
+
+    Cada fase se mide con ``with profiler.scope("nombre"):``; los módulos de
+    dibujo suman llamadas y vértices con count_draw(). Al cerrar el frame se
+    guardan los valores en ventanas móviles (percentiles) y en una traza que
+    se puede exportar a JSON o CSV.
+
+    Se puede sumar desde cualquier hilo (el GC o el pool de entidades cuentan
+    desde el hilo de simulación); un lock protege los valores del frame.
+    """
+
+    def __init__(self, window=300, trace_frames=36000):
+        self.window = window
+        self.samples = {}                       # fase -> deque de ms
+        self.trace = deque(maxlen=trace_frames) # un dict por frame
+        self.frame = 0
+        self.counters = set()                   # nombres que son contadores (no ms)
+        self._times = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def scope(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, (time.perf_counter() - start) * 1000)
+
+    def add_time(self, name, ms):
+        with self._lock:
+            self._times[name] = self._times.get(name, 0.0) + ms
+
+    def count(self, name, n=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def count_draw(self, vertices):
+        self.count("draw_calls")
+        self.count("vertices", vertices)
+
+    def end_frame(self):
+        with self._lock:
+            times, counters = self._times, self._counters
+            self._times = {}
+            self._counters = {}
+        row = {"frame": self.frame}
+        for name, ms in times.items():
+            self.samples.setdefault(name, deque(maxlen=self.window)).append(ms)
+            row[name] = round(ms, 4)
+        for name, n in counters.items():
+            self.counters.add(name)
+            self.samples.setdefault(name, deque(maxlen=self.window)).append(n)
+            row[name] = n
+        self.trace.append(row)
+        self.frame += 1
+
+    def percentiles(self, name):
+        """(p50, p95, p99) de la ventana móvil de una fase o contador."""
+        values = self.samples.get(name)
+        if not values:
+            return 0.0, 0.0, 0.0
+        return tuple(np.percentile(np.fromiter(values, dtype=float), (50, 95, 99)))
+
+    def summary(self):
+        return {name: self.percentiles(name) for name in self.samples}
+
+    def export(self, path):
+        """Guarda la traza completa (.json o .csv)."""
+        rows = list(self.trace)
+        if path.endswith(".csv"):
+            fields = ["frame"] + sorted({k for row in rows for k in row} - {"frame"})
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=fields, restval=0)
+                writer.writeheader()
+                writer.writerows(rows)
+        else:
+            with open(path, "w") as f:
+                json.dump({"summary": self.summary(), "frames": rows}, f)
+
+# Profiler global del juego (los módulos de dibujo cuentan llamadas aquí)
+profiler = FrameProfiler()
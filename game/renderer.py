@@ -0,0 +1,333 @@
+import ctypes
+import math
+from OpenGL.GL import *
+from OpenGL.GLU import gluPerspective
+import numpy as np
+from game.profiler import profiler
+from game.particles import draw_points
+
+# Cámara del juego: gluPerspective(fov, aspect, near, far) + glTranslatef(*eye)
+FOV, NEAR, FAR = 45.0, 0.1, 120.0
+EYE = (0.0, -1.3, -5.0)
+
+def perspective(fov, aspect, near, far):
+    """Matriz 4x4 equivalente a gluPerspective."""
+    f = 1.0 / math.tan(math.radians(fov) / 2.0)
+    return np.array([
+        [f / aspect, 0.0, 0.0, 0.0],
+        [0.0, f, 0.0, 0.0],
+        [0.0, 0.0, (far + near) / (near - far), 2.0 * far * near / (near - far)],
+        [0.0, 0.0, -1.0, 0.0],
+    ], dtype=np.float32)
+
+def translation(x, y, z):
+    m = np.eye(4, dtype=np.float32)
+    m[:3, 3] = (x, y, z)
+    return m
+
+class FixedRenderer:
+    """Escena 3D con el pipeline fijo (glTranslatef, glColor, texgen): el camino de siempre."""
+
+    name = "fixed"
+
+    def begin_scene(self, aspect, fov=FOV, near=NEAR, far=FAR, eye=EYE):
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        gluPerspective(fov, aspect, near, far)
+        glMatrixMode(GL_MODELVIEW)
+        glLoadIdentity()
+        glTranslatef(*eye)
+
+    def end_scene(self):
+        pass
+
+    def draw_quad(self, quad, tex_id, offset=(0.0, 0.0, 0.0)):
+        glPushMatrix()
+        glTranslatef(*offset)
+        quad.draw(tex_id)
+        glPopMatrix()
+
+    def draw_batch(self, batch, xs, zs, colors=None):
+        batch.draw(xs, zs, colors)
+
+    def draw_mesh(self, mesh, offset, color):
+        glPushMatrix()
+        glTranslatef(*offset)
+        glColor3f(*color)
+        mesh.draw()
+        glPopMatrix()
+
+    def draw_particles(self, pos, color):
+        draw_points(pos, color)
+
+# -----------------------
+# Backend GLSL
+# -----------------------
+
+# Atributos fijos de todos los programas; un atributo sin array toma su
+# valor actual (glVertexAttrib*), así el desplazamiento y el color del
+# jugador o del suelo no necesitan buffers.
+A_POSITION, A_OFFSET, A_COLOR, A_TEXCOORD = range(4)
+
+VERTEX_HEADER = """
+#version 330 core
+layout(std140) uniform Matrices {
+    mat4 projection;
+    mat4 view;
+};
+layout(location = 0) in vec3 a_position;
+layout(location = 1) in vec3 a_offset;    // por instancia
+layout(location = 2) in vec4 a_color;     // por instancia o por vértice
+layout(location = 3) in vec2 a_texcoord;
+out vec4 v_color;
+out vec2 v_texcoord;
+"""
+
+VERTEX_SHADERS = {
+    "unlit": """
+void main() {
+    v_color = a_color;
+    v_texcoord = vec2(0.0);
+    gl_Position = projection * view * vec4(a_position + a_offset, 1.0);
+}
+""",
+    "textured": """
+void main() {
+    v_color = a_color;
+    v_texcoord = a_texcoord;
+    gl_Position = projection * view * vec4(a_position + a_offset, 1.0);
+}
+""",
+    # Igual que GL_SPHERE_MAP: reflexión en coordenadas de ojo con la normal
+    # tal cual (sin normalizar, como el pipeline fijo sin GL_NORMALIZE)
+    "sphere_map": """
+uniform vec3 u_normal;
+void main() {
+    vec4 eye = view * vec4(a_position + a_offset, 1.0);
+    vec3 r = reflect(normalize(eye.xyz), mat3(view) * u_normal);
+    float m = 2.0 * sqrt(r.x * r.x + r.y * r.y + (r.z + 1.0) * (r.z + 1.0));
+    v_color = a_color;
+    v_texcoord = r.xy / m + 0.5;
+    gl_Position = projection * eye;
+}
+""",
+}
+
+FRAGMENT_SHADERS = {
+    "unlit": """
+#version 330 core
+in vec4 v_color;
+in vec2 v_texcoord;
+out vec4 frag_color;
+void main() {
+    frag_color = v_color;
+}
+""",
+    "textured": """
+#version 330 core
+uniform sampler2D u_texture;
+in vec4 v_color;
+in vec2 v_texcoord;
+out vec4 frag_color;
+void main() {
+    frag_color = texture(u_texture, v_texcoord) * v_color;
+}
+""",
+}
+FRAGMENT_SHADERS["sphere_map"] = FRAGMENT_SHADERS["textured"]
+
+def compile_program(vertex_src, fragment_src):
+    """Compila y enlaza un programa; lanza RuntimeError con el log si falla."""
+    program = glCreateProgram()
+    shaders = []
+    for kind, src in ((GL_VERTEX_SHADER, vertex_src), (GL_FRAGMENT_SHADER, fragment_src)):
+        shader = glCreateShader(kind)
+        glShaderSource(shader, src)
+        glCompileShader(shader)
+        if not glGetShaderiv(shader, GL_COMPILE_STATUS):
+            raise RuntimeError(glGetShaderInfoLog(shader).decode(errors="replace"))
+        glAttachShader(program, shader)
+        shaders.append(shader)
+    glLinkProgram(program)
+    if not glGetProgramiv(program, GL_LINK_STATUS):
+        raise RuntimeError(glGetProgramInfoLog(program).decode(errors="replace"))
+    for shader in shaders:
+        glDetachShader(program, shader)
+        glDeleteShader(shader)
+    return program
+
+class ShaderRenderer:
+    """
+    Escena 3D con shaders GLSL 3.30 (sin colores, texturizado y sphere map).
+
+    Las matrices van en un uniform buffer compartido por los tres programas
+    y se escriben una vez por frame. Cada MeshBatch se dibuja instanciado:
+    el modelo queda en la GPU y por frame solo se suben los desplazamientos
+    (y colores) de las instancias, en lugar de todos sus vértices.
+    """
+
+    name = "glsl"
+
+    def __init__(self):
+        self.programs = {}
+        for name, vertex in VERTEX_SHADERS.items():
+            program = compile_program(VERTEX_HEADER + vertex, FRAGMENT_SHADERS[name])
+            glUniformBlockBinding(program, glGetUniformBlockIndex(program, "Matrices"), 0)
+            self.programs[name] = program
+        program = self.programs["sphere_map"]
+        self.u_normal = glGetUniformLocation(program, "u_normal")
+        for name in ("textured", "sphere_map"):
+            glUseProgram(self.programs[name])
+            glUniform1i(glGetUniformLocation(self.programs[name], "u_texture"), 0)
+        glUseProgram(0)
+
+        self.vao = glGenVertexArrays(1)
+        self.ubo = glGenBuffers(1)
+        glBindBuffer(GL_UNIFORM_BUFFER, self.ubo)
+        glBufferData(GL_UNIFORM_BUFFER, 128, None, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+        self.matrices = np.zeros((2, 4, 4), dtype=np.float32)
+        self.buffers = {}  # objeto -> buffers propios de este backend
+        self.current = None
+
+    def _use(self, name):
+        if self.current != name:
+            glUseProgram(self.programs[name])
+            self.current = name
+
+    def begin_scene(self, aspect, fov=FOV, near=NEAR, far=FAR, eye=EYE):
+        # std140 guarda las mat4 por columnas: se suben traspuestas
+        self.matrices[0] = perspective(fov, aspect, near, far).T
+        self.matrices[1] = translation(*eye).T
+        glBindBuffer(GL_UNIFORM_BUFFER, self.ubo)
+        glBufferSubData(GL_UNIFORM_BUFFER, 0, self.matrices.nbytes, self.matrices)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+        glBindBufferBase(GL_UNIFORM_BUFFER, 0, self.ubo)
+        glBindVertexArray(self.vao)
+
+    def end_scene(self):
+        glUseProgram(0)
+        self.current = None
+        glBindVertexArray(0)
+
+    def _attrib(self, index, size, buffer, stride=0, offset=0, divisor=0):
+        glBindBuffer(GL_ARRAY_BUFFER, buffer)
+        glEnableVertexAttribArray(index)
+        glVertexAttribPointer(index, size, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(offset))
+        glVertexAttribDivisor(index, divisor)
+
+    def _disable(self, *indices):
+        for index in indices:
+            glVertexAttribDivisor(index, 0)
+            glDisableVertexAttribArray(index)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw_quad(self, quad, tex_id, offset=(0.0, 0.0, 0.0)):
+        if quad.vbo is None:
+            quad.upload()
+        self._use("textured")
+        glBindTexture(GL_TEXTURE_2D, tex_id)
+        glVertexAttrib3f(A_OFFSET, *offset)
+        glVertexAttrib4f(A_COLOR, 1.0, 1.0, 1.0, 1.0)
+        self._attrib(A_POSITION, 3, quad.vbo, stride=20)
+        self._attrib(A_TEXCOORD, 2, quad.vbo, stride=20, offset=12)
+        glDrawArrays(GL_TRIANGLE_FAN, 0, 4)
+        self._disable(A_POSITION, A_TEXCOORD)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        profiler.count_draw(4)
+
+    def _batch_buffers(self, batch):
+        """Modelo ya transformado (local) e índices del tipo, subidos una vez."""
+        buffers = self.buffers.get(batch)
+        if buffers is None:
+            vbo, ibo, instances, colors = glGenBuffers(4)
+            glBindBuffer(GL_ARRAY_BUFFER, vbo)
+            glBufferData(GL_ARRAY_BUFFER, batch.local.nbytes, batch.local, GL_STATIC_DRAW)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ibo)
+            glBufferData(GL_ELEMENT_ARRAY_BUFFER, batch.mesh_indices.nbytes, batch.mesh_indices, GL_STATIC_DRAW)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+            buffers = self.buffers[batch] = (vbo, ibo, instances, colors)
+        return buffers
+
+    def draw_batch(self, batch, xs, zs, colors=None):
+        for level, lxs, lzs, lcolors in batch.split(xs, zs, colors):
+            self._draw_instanced(level, lxs, lzs, lcolors)
+
+    def _draw_instanced(self, batch, xs, zs, colors):
+        n = len(xs)
+        if n == 0:
+            return
+        vbo, ibo, instances, color_buffer = self._batch_buffers(batch)
+        offsets = np.empty((n, 3), dtype=np.float32)
+        offsets[:, 0] = xs
+        offsets[:, 1] = batch.y
+        offsets[:, 2] = zs
+
+        if batch.texture is not None:
+            self._use("sphere_map" if batch.sphere_map else "textured")
+            if batch.sphere_map:
+                glUniform3f(self.u_normal, *batch.normal)
+            glBindTexture(GL_TEXTURE_2D, batch.texture)
+        else:
+            self._use("unlit")
+
+        self._attrib(A_POSITION, 3, vbo)
+        glBindBuffer(GL_ARRAY_BUFFER, instances)
+        glBufferData(GL_ARRAY_BUFFER, offsets.nbytes, offsets, GL_STREAM_DRAW)
+        self._attrib(A_OFFSET, 3, instances, divisor=1)
+        if colors is not None:
+            colors = np.ascontiguousarray(colors, dtype=np.float32)
+            glBindBuffer(GL_ARRAY_BUFFER, color_buffer)
+            glBufferData(GL_ARRAY_BUFFER, colors.nbytes, colors, GL_STREAM_DRAW)
+            self._attrib(A_COLOR, 3, color_buffer, divisor=1)
+        else:
+            glVertexAttrib4f(A_COLOR, *batch.color, 1.0)
+
+        count = len(batch.mesh_indices)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ibo)
+        glDrawElementsInstanced(GL_TRIANGLES, count, GL_UNSIGNED_INT, None, n)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        profiler.count_draw(count * n)
+
+        self._disable(A_POSITION, A_OFFSET, *((A_COLOR,) if colors is not None else ()))
+        if batch.texture is not None:
+            glBindTexture(GL_TEXTURE_2D, 0)
+
+    def draw_mesh(self, mesh, offset, color):
+        if mesh.vbo is None:
+            mesh.upload()
+        self._use("unlit")
+        glVertexAttrib3f(A_OFFSET, *offset)
+        glVertexAttrib4f(A_COLOR, *color, 1.0)
+        self._attrib(A_POSITION, 3, mesh.vbo)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, mesh.ibo)
+        glDrawElements(GL_TRIANGLES, mesh.count, GL_UNSIGNED_INT, None)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        self._disable(A_POSITION)
+        profiler.count_draw(mesh.count)
+
+    def draw_particles(self, pos, color):
+        if len(pos) == 0:
+            return
+        buffers = self.buffers.get("particulas")
+        if buffers is None:
+            buffers = self.buffers["particulas"] = tuple(glGenBuffers(2))
+        self._use("unlit")
+        glVertexAttrib3f(A_OFFSET, 0.0, 0.0, 0.0)
+        for index, buffer, data in ((A_POSITION, buffers[0], pos), (A_COLOR, buffers[1], color)):
+            glBindBuffer(GL_ARRAY_BUFFER, buffer)
+            glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_STREAM_DRAW)
+            self._attrib(index, 3, buffer)
+        glPointSize(4)
+        glDrawArrays(GL_POINTS, 0, len(pos))
+        self._disable(A_POSITION, A_COLOR)
+        profiler.count_draw(len(pos))
+
+def make_renderer(name="fixed"):
+    """Crea el backend pedido; si los shaders no compilan vuelve al pipeline fijo."""
+    if name == "glsl":
+        try:
+            return ShaderRenderer()
+        except Exception as e:
+            print(f"No se pudo usar el renderer GLSL ({e}); se usa el pipeline fijo")
+    return FixedRenderer()
@@ -0,0 +1,171 @@
+"""
+Grabación y reproducción determinista de partidas.
+
+Una partida queda definida por la semilla del RNG, el paso fijo y las
+teclas de cada paso; como las teclas cambian pocas veces, solo se guardan
+los cambios: (pasos desde el cambio anterior como varint, bits izq/der).
+Una partida de varios minutos ocupa unos cientos de bytes.
+
+Uso: python -m game.replay partida.lmr [...]   (reproduce sin pantalla a
+máxima velocidad, comprueba el resultado y mide el tiempo por paso)
+"""
+import argparse
+import random
+import struct
+import sys
+import time
+import numpy as np
+from game.simulation import GameSimulation
+
+MAGIC = b"LMRP"
+VERSION = 1
+# magic, versión, pasos por segundo, semilla, vida máxima, puntaje final,
+# vida final, pasos jugados, nº de cambios de teclas
+HEADER = struct.Struct("<4sHHQHiiII")
+
+LEFT, RIGHT = 1, 2
+
+def _write_varint(out, n):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+def _read_varint(data, pos):
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+class Replay:
+    """Semilla + cambios de teclas por paso de una partida; sirve para grabar y para reproducir."""
+
+    def __init__(self, seed=None, tick_rate=60, max_health=100):
+        self.seed = random.randrange(2**32) if seed is None else seed
+        self.tick_rate = tick_rate
+        self.max_health = max_health
+        self.steps = 0
+        self.changes = []  # (paso, bits) cada vez que cambian las teclas
+        self.score = 0
+        self.health = max_health
+        self._keys = 0
+
+    def new_simulation(self):
+        return GameSimulation(seed=self.seed, dt_ms=1000 / self.tick_rate, max_health=self.max_health)
+
+    # -----------------------
+    # Grabación
+    # -----------------------
+
+    def record(self, left, right):
+        """Anota las teclas del paso que se va a simular."""
+        keys = (LEFT if left else 0) | (RIGHT if right else 0)
+        if keys != self._keys:
+            self.changes.append((self.steps, keys))
+            self._keys = keys
+        self.steps += 1
+
+    def finish(self, sim):
+        """Guarda el resultado de la partida para poder verificar la reproducción."""
+        self.score = sim.score
+        self.health = sim.health
+
+    # -----------------------
+    # Reproducción
+    # -----------------------
+
+    def inputs(self):
+        """(left, right) de cada paso grabado."""
+        keys = 0
+        changes = iter(self.changes)
+        next_step, next_keys = next(changes, (None, 0))
+        for step in range(self.steps):
+            if step == next_step:
+                keys = next_keys
+                next_step, next_keys = next(changes, (None, 0))
+            yield bool(keys & LEFT), bool(keys & RIGHT)
+
+    def matches(self, sim):
+        return sim.score == self.score and sim.health == self.health
+
+    def play(self, step_times=None):
+        """Reproduce sin pantalla a máxima velocidad; si se pasa una lista, anota ms por paso."""
+        sim = self.new_simulation()
+        if step_times is None:
+            sim.run(self.inputs())
+            return sim
+        for left, right in self.inputs():
+            if sim.game_over:
+                break
+            start = time.perf_counter()
+            sim.step(left, right)
+            step_times.append((time.perf_counter() - start) * 1000)
+        return sim
+
+    # -----------------------
+    # Formato binario
+    # -----------------------
+
+    def to_bytes(self):
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.tick_rate, self.seed, self.max_health,
+                                    self.score, self.health, self.steps, len(self.changes)))
+        previous = 0
+        for step, keys in self.changes:
+            _write_varint(out, step - previous)
+            out.append(keys)
+            previous = step
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, tick_rate, seed, max_health, score, health, steps, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("no es un replay de LawnMayhem (o es de otra versión)")
+        replay = cls(seed, tick_rate, max_health)
+        replay.score, replay.health, replay.steps = score, health, steps
+        pos, step = HEADER.size, 0
+        for _ in range(count):
+            delta, pos = _read_varint(data, pos)
+            step += delta
+            replay.changes.append((step, data[pos]))
+            pos += 1
+        replay._keys = replay.changes[-1][1] if replay.changes else 0
+        return replay
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reproduce replays sin pantalla")
+    parser.add_argument("replays", nargs="+")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for path in args.replays:
+        replay = Replay.load(path)
+        step_times = []
+        start = time.perf_counter()
+        sim = replay.play(step_times)
+        total = time.perf_counter() - start
+        ok = replay.matches(sim)
+        failed += not ok
+        p50, p95, p99 = np.percentile(step_times or [0.0], (50, 95, 99))
+        print(f"{path}: {len(step_times)} pasos en {total * 1000:.1f} ms "
+              f"({len(step_times) / total if total else 0:.0f} pasos/s), "
+              f"puntaje {sim.score} vida {sim.health} -> {'OK' if ok else 'DISTINTO'} "
+              f"(grabado: {replay.score} / {replay.health})   "
+              f"paso p50 {p50:.3f} p95 {p95:.3f} p99 {p99:.3f} ms")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+import pygame
+from OpenGL.GL import *
+
+# Eventos de ventana tras los que hay que volver a presentar la pantalla
+REDRAW_EVENTS = {pygame.VIDEOEXPOSE, pygame.VIDEORESIZE, pygame.WINDOWEXPOSED,
+                 pygame.WINDOWSHOWN, pygame.WINDOWRESTORED, pygame.WINDOWSIZECHANGED}
+
+def wait_events(timeout_ms):
+    """Duerme hasta que llegue un evento (o pase el timeout) y devuelve todos los pendientes."""
+    first = pygame.event.wait(timeout_ms)
+    if first.type == pygame.NOEVENT:
+        return []
+    return [first] + pygame.event.get()
+
+class FrameCache:
+    """
+    Copia de la última pantalla estática (menú, pausa, game over) en una textura.
+
+    La pantalla se dibuja una sola vez por clave; mientras la clave no cambie
+    solo se vuelve a presentar la copia (un quad) cuando la ventana lo pide,
+    y si no pasa nada no se dibuja nada.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.tex_id = None
+        self.key = None
+
+    def capture(self, key):
+        """Copia el back buffer (ya dibujado) a la textura."""
+        if self.tex_id is None:
+            self.tex_id = glGenTextures(1)
+            glBindTexture(GL_TEXTURE_2D, self.tex_id)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        else:
+            glBindTexture(GL_TEXTURE_2D, self.tex_id)
+        glCopyTexImage2D(GL_TEXTURE_2D, 0, GL_RGB, 0, 0, self.width, self.height, 0)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        self.key = key
+
+    def invalidate(self):
+        self.key = None
@@ -0,0 +1,172 @@
+import random
+from game.entities import EntityStore, CONEJO, GNOMO, PIEDRA, HEART, SHIELD
+from game.spawner import Spawner
+
+FRAME_MS = 1000 / 60
+MOVE_COOLDOWN_MS = 120   # tiempo mínimo entre cambios de carril
+COMBO_MS = 2500          # tiempo para mantener el combo
+SHIELD_MS = 4000         # duración del escudo
+DIFFICULTY_MS = 8000     # cada cuánto sube la velocidad
+SPEED_STEP = 0.15        # cuánto sube cada vez
+MAX_SPEED = 6.0          # velocidad máxima
+
+class FixedTimestep:
+    """
+    Acumulador de paso fijo: convierte el tiempo real de cada frame en un
+    número entero de pasos de simulación, con un tope de pasos de recuperación.
+    """
+
+    def __init__(self, tick_rate=60, max_steps=5):
+        self.dt_ms = 1000 / tick_rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def advance(self, elapsed_ms):
+        """Pasos a simular para este frame."""
+        self.accumulator += elapsed_ms
+        steps = min(int(self.accumulator // self.dt_ms), self.max_steps)
+        self.accumulator -= steps * self.dt_ms
+        if self.accumulator >= self.dt_ms:
+            # Demasiado atraso: se descarta en vez de entrar en espiral
+            self.accumulator %= self.dt_ms
+        return steps
+
+    @property
+    def alpha(self):
+        """Fracción del siguiente paso ya transcurrida (para interpolar al dibujar)."""
+        return self.accumulator / self.dt_ms
+
+    def reset(self):
+        self.accumulator = 0.0
+
+class GameSimulation:
+    """
+    Toda la lógica de una partida, sin pygame ni OpenGL.
+
+    Avanza con step() a paso fijo (o con el dt que se le pase) a partir de la
+    entrada del jugador; el RNG es propio y sembrable, así que la misma
+    semilla y la misma entrada producen la misma partida. El renderer solo
+    lee su estado.
+    """
+
+    def __init__(self, seed=None, dt_ms=FRAME_MS, max_health=100):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.dt_ms = dt_ms
+        self.time_ms = 0
+
+        self.player_x = 0
+        self.score = 0
+        self.base_speed = 2.0
+        self.health = max_health
+        self.max_health = max_health
+
+        self.combo = 0
+        self.combo_timer = 0         # ms restantes para mantener combo
+        self.multiplier = 1
+        self.shield_ms = 0           # tiempo de escudo restante
+        self.difficulty_timer = 0    # incrementa dificultad cada X ms
+
+        # Reglas de la rampa de dificultad (ajustables para balancear)
+        self.difficulty_ms = DIFFICULTY_MS
+        self.speed_step = SPEED_STEP
+        self.max_speed = MAX_SPEED
+
+        self.entities = EntityStore()
+        self.spawner = Spawner(self.rng)
+        self.last_move_ms = -MOVE_COOLDOWN_MS - 1
+
+        # Efectos del último paso: (x, y, z, color) para las partículas (se reutiliza la lista)
+        self.events = []
+
+    @property
+    def game_over(self):
+        return self.health <= 0
+
+    def step(self, left=False, right=False, dt_ms=None):
+        """Avanza un paso con las teclas izquierda/derecha presionadas; devuelve los efectos."""
+        if dt_ms is None:
+            dt_ms = self.dt_ms
+        self.time_ms += dt_ms
+        self.events.clear()
+
+        # Rampa de dificultad
+        self.difficulty_timer += dt_ms
+        if self.difficulty_timer >= self.difficulty_ms:
+            self.difficulty_timer = 0
+            self.base_speed = min(self.base_speed + self.speed_step, self.max_speed)
+
+        # Cambio de carril
+        if self.time_ms - self.last_move_ms > MOVE_COOLDOWN_MS:
+            if left and self.player_x > -2:
+                self.player_x -= 2
+                self.last_move_ms = self.time_ms
+            elif right and self.player_x < 2:
+                self.player_x += 2
+                self.last_move_ms = self.time_ms
+
+        # Spawner
+        self.spawner.spawn(self.entities)
+
+        speed = self.base_speed * dt_ms / FRAME_MS
+
+        # Timers
+        if self.combo_timer > 0:
+            self.combo_timer = max(0, self.combo_timer - dt_ms)
+            if self.combo_timer == 0:
+                self.combo = 0
+                self.multiplier = 1
+        if self.shield_ms > 0:
+            self.shield_ms = max(0, self.shield_ms - dt_ms)
+
+        # Actualizar & colisiones (vectorizado)
+        self.entities.advance(speed)
+        self.spawner.advance(speed)
+        for kind, x, z in self.entities.collide(self.player_x):
+            self._on_hit(kind, x, z)
+
+        # Descartes
+        self.entities.cull()
+        return self.events
+
+    def _on_hit(self, kind, x, z):
+        if kind == CONEJO:
+            self.score += 10 * self.multiplier
+            self.combo += 1
+            self.combo_timer = COMBO_MS
+            self.multiplier = 1 + (self.combo // 5)
+            self.events.append((x, 0.5, z, (1, 0.4, 0.4)))
+        elif kind == GNOMO:
+            self.score -= 5
+            self._break_combo()
+            self.events.append((x, 0.5, z, (1, 0.5, 1)))
+        elif kind == PIEDRA:
+            if self.shield_ms > 0:
+                self.events.append((x, 0.5, z, (0.4, 0.7, 1.0)))
+            else:
+                self.health -= 10
+                self._break_combo()
+                self.events.append((x, 0.5, z, (1, 1, 0)))
+        else:
+            # Power-ups
+            if kind == HEART:
+                self.health = min(self.max_health, self.health + 20)
+            elif kind == SHIELD:
+                self.shield_ms = SHIELD_MS
+            self.events.append((x, 0.6, z, (0.9, 0.9, 1.0)))
+
+    def _break_combo(self):
+        self.combo = 0
+        self.multiplier = 1
+        self.combo_timer = 0
+
+    def run(self, inputs, max_steps=None):
+        """
+        Juega sin pantalla a partir de un flujo de entradas (left, right) por paso.
+        Termina con el game over, al agotarse la entrada o tras max_steps; devuelve el puntaje.
+        """
+        for steps, (left, right) in enumerate(inputs):
+            if self.game_over or (max_steps is not None and steps >= max_steps):
+                break
+            self.step(left, right)
+        return self.score
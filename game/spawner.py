@@ -0,0 +1,93 @@
+import random
+from collections import deque
+from game.conejo import Conejo
+from game.gnomo import Gnomo
+from game.piedra import Piedra
+from game.powerup import PowerUp
+from game.pool import Pool
+
+LANES = (-2, 0, 2)
+FIRST_WAVE_Z = -10
+WAVE_SPACING = 6
+SPAWN_TRIGGER_Z = -30    # nueva oleada cuando todo está más cerca que esto
+POWERUP_CHANCE = 0.2     # probabilidad de power-up por oleada
+
+def _new(cls, *args):
+    return cls(*args)
+
+def generate_wave(z_pos, rng=random, new=_new):
+    options = ["conejo", "gnomo", "piedra"]
+    lanes = list(LANES)
+    rng.shuffle(lanes)
+
+    conejos, gnomos, piedras = [], [], []
+
+    for _ in range(3):
+        obj_type = rng.choice(options)
+        options.remove(obj_type)
+        lane = lanes.pop()
+        if obj_type == "conejo":
+            conejos.append(new(Conejo, lane, z_pos))
+        elif obj_type == "gnomo":
+            gnomos.append(new(Gnomo, lane, z_pos))
+        elif obj_type == "piedra":
+            piedras.append(new(Piedra, lane, z_pos))
+
+    # Chance de soltar un power-up en un carril libre
+    powerups = []
+    if rng.random() < POWERUP_CHANCE:
+        libres = set(LANES) - set([o.x for o in conejos + gnomos + piedras])
+        if libres:
+            lane = rng.choice(sorted(libres))
+            kind = rng.choice(["heart", "shield"])
+            powerups.append(new(PowerUp, kind, lane, z_pos))
+
+    return conejos, gnomos, piedras, powerups
+
+class Spawner:
+    """
+    Oleadas pregeneradas con anticipación.
+
+    Las oleadas se generan en refill() (al cargar o en tiempo ocioso del
+    frame) con instancias recicladas de un pool; durante el juego spawn()
+    solo copia la siguiente oleada al EntityStore. Como todas las entidades
+    avanzan igual, la oleada más reciente es siempre la más lejana: basta
+    un escalar para saber cuándo toca la siguiente.
+    """
+
+    def __init__(self, rng=random, lookahead=64):
+        self.rng = rng
+        self.lookahead = lookahead
+        self.waves = deque()
+        self.next_wave_z = FIRST_WAVE_Z
+        self.farthest_z = float("inf")   # z de la última oleada (inf: ninguna)
+        self.pools = {cls: Pool(cls) for cls in (Conejo, Gnomo, Piedra, PowerUp)}
+        self.refill()
+
+    def _acquire(self, cls, *args):
+        return self.pools[cls].acquire(*args)
+
+    def refill(self, max_waves=None):
+        """Genera oleadas hasta llenar el buffer (o hasta max_waves)."""
+        missing = self.lookahead - len(self.waves)
+        if max_waves is not None:
+            missing = min(missing, max_waves)
+        for _ in range(missing):
+            self.waves.append(generate_wave(self.next_wave_z, self.rng, self._acquire))
+            self.next_wave_z -= WAVE_SPACING
+
+    def spawn(self, entities):
+        """Si la última oleada ya se acercó lo suficiente, agrega la siguiente."""
+        if self.farthest_z <= SPAWN_TRIGGER_Z:
+            return
+        if not self.waves:
+            self.refill(1)  # buffer vacío: se genera en el momento
+        wave = self.waves.popleft()
+        entities.add_wave(*wave)
+        for group in wave:
+            for obj in group:
+                self.farthest_z = obj.z
+                self.pools[type(obj)].release(obj)
+
+    def advance(self, speed):
+        self.farthest_z += speed
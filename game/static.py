@@ -0,0 +1,114 @@
+import ctypes
+from OpenGL.GL import *
+import numpy as np
+from game.profiler import profiler
+
+class TexturedQuad:
+    """Quad texturizado que no cambia (fondo, suelo): se sube a un VBO una sola vez."""
+
+    def __init__(self, corners, texcoords):
+        # posición (x, y, z) + coordenada de textura (s, t) intercalados
+        data = np.hstack([np.asarray(corners, dtype=np.float32),
+                          np.asarray(texcoords, dtype=np.float32)])
+        self.data = np.ascontiguousarray(data)
+        self.vbo = None
+
+    def upload(self):
+        self.vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, self.data.nbytes, self.data, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self, tex_id):
+        if self.vbo is None:
+            self.upload()
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+
+        glEnable(GL_TEXTURE_2D)
+        glBindTexture(GL_TEXTURE_2D, tex_id)
+        glColor3f(1.0, 1.0, 1.0)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 20, ctypes.c_void_p(0))
+        glTexCoordPointer(2, GL_FLOAT, 20, ctypes.c_void_p(12))
+        glDrawArrays(GL_QUADS, 0, 4)
+        glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glDisable(GL_TEXTURE_2D)
+        profiler.count_draw(4)
+
+class QuadLayer:
+    """
+    Paneles y barras 2D del HUD horneados en un solo VBO.
+
+    Los quads se declaran una vez con add(); cada frame solo se reescriben
+    (glBufferSubData) los que cambiaron de tamaño, como el relleno de las
+    barras, y todo se dibuja con una llamada. Un quad oculto es un quad de
+    ancho cero.
+    """
+
+    def __init__(self):
+        self.rects = []
+        self.colors = []
+        self.visible = []
+        self.vbo = None
+        self.color_offset = 0
+        self._dirty = set()
+
+    def add(self, x, y, w, h, color, visible=True):
+        self.rects.append((x, y, w, h))
+        self.colors.append(color)
+        self.visible.append(visible)
+        return len(self.rects) - 1
+
+    def _corners(self, i):
+        x, y, w, h = self.rects[i]
+        if not self.visible[i]:
+            w = h = 0
+        return ((x, y), (x + w, y), (x + w, y + h), (x, y + h))
+
+    def _build(self):
+        n = len(self.rects)
+        positions = np.array([self._corners(i) for i in range(n)], dtype=np.float32).reshape(-1, 2)
+        colors = np.repeat(np.asarray(self.colors, dtype=np.float32), 4, axis=0)
+        self.color_offset = positions.nbytes
+        self.vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, positions.nbytes + colors.nbytes, None, GL_DYNAMIC_DRAW)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, positions.nbytes, positions)
+        glBufferSubData(GL_ARRAY_BUFFER, self.color_offset, colors.nbytes, colors)
+        self._dirty.clear()
+
+    def set_rect(self, i, x, y, w, h):
+        rect = (x, y, w, h)
+        if self.rects[i] != rect:
+            self.rects[i] = rect
+            self._dirty.add(i)
+
+    def set_visible(self, i, visible):
+        if self.visible[i] != visible:
+            self.visible[i] = visible
+            self._dirty.add(i)
+
+    def draw(self):
+        """Dibuja todos los quads; requiere proyección 2D y blending activos."""
+        if self.vbo is None:
+            self._build()
+        else:
+            glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+            for i in self._dirty:
+                quad = np.array(self._corners(i), dtype=np.float32)
+                glBufferSubData(GL_ARRAY_BUFFER, i * quad.nbytes, quad.nbytes, quad)
+            self._dirty.clear()
+
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glVertexPointer(2, GL_FLOAT, 0, ctypes.c_void_p(0))
+        glColorPointer(4, GL_FLOAT, 0, ctypes.c_void_p(self.color_offset))
+        glDrawArrays(GL_QUADS, 0, len(self.rects) * 4)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        profiler.count_draw(len(self.rects) * 4)
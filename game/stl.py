@@ -0,0 +1,50 @@
+"""
+Lector de STL (binario y ASCII).
+
+El STL binario es una cabecera de 80 bytes, el número de triángulos y un
+registro fijo de 50 bytes por triángulo (normal, tres vértices y 2 bytes
+de atributos), así que se lee con ``numpy.frombuffer`` y un dtype
+estructurado, sin copiar ni recorrer nada en Python. Un STL es una sopa de
+triángulos sueltos: los vértices se sueldan para obtener una malla
+indexada como la de un OBJ. Las normales por cara se descartan (con ellas
+ningún vértice se podría compartir).
+"""
+import re
+import struct
+import numpy as np
+from game.meshopt import weld
+
+HEADER_SIZE = 84  # 80 bytes libres + nº de triángulos (uint32)
+RECORD = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("vertices", "<f4", (3, 3)),
+    ("attributes", "<u2"),
+])
+
+_VERTEX = re.compile(rb"vertex\s+(\S+\s+\S+\s+\S+)")
+
+def is_binary(data):
+    """Un STL binario mide exactamente cabecera + 50 bytes por triángulo (aunque empiece con 'solid')."""
+    if len(data) < HEADER_SIZE:
+        return False
+    count, = struct.unpack_from("<I", data, 80)
+    return len(data) == HEADER_SIZE + count * RECORD.itemsize
+
+def triangle_soup(data):
+    """(3T, 3) float32 con los vértices de cada triángulo, en orden."""
+    if is_binary(data):
+        records = np.frombuffer(data, dtype=RECORD, offset=HEADER_SIZE)
+        return records["vertices"].reshape(-1, 3)
+    if not data.lstrip().startswith(b"solid"):
+        raise ValueError("no es un STL")
+    values = np.fromstring(b" ".join(_VERTEX.findall(data)), dtype=np.float32, sep=" ")
+    if len(values) % 9:
+        raise ValueError("STL ASCII con una cara incompleta")
+    return values.reshape(-1, 3)
+
+def parse_stl(filepath):
+    """(vértices (N, 3) float32 soldados, índices uint32 de triángulos, layout 0), como parse_obj."""
+    with open(filepath, "rb") as f:
+        soup = triangle_soup(f.read())
+    positions, indices = weld(soup, np.arange(len(soup), dtype=np.uint32))
+    return positions, indices, 0
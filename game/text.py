@@ -0,0 +1,87 @@
+from collections import OrderedDict
+import pygame
+from OpenGL.GL import *
+from game.profiler import profiler
+
+# Márgenes que ocupan el contorno (1 px) y la sombra (+2, -2) alrededor del texto
+PAD_LEFT, PAD_TOP = 1, 1
+PAD_RIGHT, PAD_BOTTOM = 2, 2
+
+class TextRenderer:
+    """
+    Cache LRU de textos rasterizados como texturas.
+
+    Cada combinación (texto, fuente, color, sombra, contorno) se renderiza con
+    pygame una sola vez, con la sombra y el contorno ya compuestos, y se sube a
+    una textura; dibujarla de nuevo es un solo quad texturizado.
+    """
+
+    def __init__(self, capacity=128):
+        self.capacity = capacity
+        self.cache = OrderedDict()
+
+    def _bake(self, text, font, color, shadow, outline):
+        fill = font.render(text, True, color)
+        w, h = fill.get_size()
+        surf = pygame.Surface((w + PAD_LEFT + PAD_RIGHT, h + PAD_TOP + PAD_BOTTOM), pygame.SRCALPHA)
+
+        if shadow or outline:
+            dark = font.render(text, True, (0, 0, 0))
+            if shadow:
+                dark.set_alpha(140)
+                surf.blit(dark, (PAD_LEFT + 2, PAD_TOP + 2))
+            if outline:
+                dark.set_alpha(200)
+                for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                    surf.blit(dark, (PAD_LEFT + dx, PAD_TOP + dy))
+        surf.blit(fill, (PAD_LEFT, PAD_TOP))
+
+        data = pygame.image.tostring(surf, "RGBA", True)
+        tw, th = surf.get_size()
+        tex_id = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, tex_id)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, tw, th, 0, GL_RGBA, GL_UNSIGNED_BYTE, data)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        return tex_id, tw, th, w, h
+
+    def get(self, text, font, color=(255, 255, 255), shadow=True, outline=True):
+        key = (text, font, tuple(color), shadow, outline)
+        entry = self.cache.get(key)
+        if entry is not None:
+            self.cache.move_to_end(key)
+            return entry
+        entry = self._bake(text, font, color, shadow, outline)
+        self.cache[key] = entry
+        if len(self.cache) > self.capacity:
+            _, (old_tex, *_rest) = self.cache.popitem(last=False)
+            glDeleteTextures([old_tex])
+        return entry
+
+    def draw(self, x, y, text, font, color=(255, 255, 255), shadow=True, outline=True):
+        """Dibuja el texto con su esquina inferior izquierda en (x, y); requiere proyección 2D."""
+        tex_id, tw, th, w, h = self.get(text, font, color, shadow, outline)
+        x0, y0 = x - PAD_LEFT, y - PAD_BOTTOM
+
+        glEnable(GL_TEXTURE_2D)
+        glBindTexture(GL_TEXTURE_2D, tex_id)
+        glColor4f(1.0, 1.0, 1.0, 1.0)
+        glBegin(GL_QUADS)
+        glTexCoord2f(0.0, 0.0); glVertex2f(x0,      y0)
+        glTexCoord2f(1.0, 0.0); glVertex2f(x0 + tw, y0)
+        glTexCoord2f(1.0, 1.0); glVertex2f(x0 + tw, y0 + th)
+        glTexCoord2f(0.0, 1.0); glVertex2f(x0,      y0 + th)
+        glEnd()
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glDisable(GL_TEXTURE_2D)
+        profiler.count_draw(4)
+        return w, h
+
+    def clear(self):
+        if self.cache:
+            glDeleteTextures([entry[0] for entry in self.cache.values()])
+        self.cache.clear()
@@ -0,0 +1,129 @@
+"""
+Texturas con mipmaps, resolución máxima configurable y cache en disco.
+
+La primera vez que se carga una imagen se decodifica con pygame, se genera
+su cadena de mipmaps (filtro de caja 2x2) y se guarda todo, RGBA crudo, en
+``<imagen>.rgba`` junto a la original. Las siguientes cargas mapean ese
+archivo con ``numpy.memmap`` y suben los niveles directamente, sin PNG.
+"""
+import os
+import struct
+import pygame
+from OpenGL.GL import *
+import numpy as np
+
+MAGIC = b"LMTX"
+VERSION = 1
+# magic, versión, mtime de la imagen, tamaño de la imagen, nº de niveles
+HEADER = struct.Struct("<4sIdQI")
+LEVEL = struct.Struct("<II")  # ancho, alto de cada nivel
+HEADER_SIZE = 256  # cabecera + tabla de niveles, rellenada
+
+def cache_path(path):
+    return path + ".rgba"
+
+def decode_image(path):
+    """Decodifica la imagen a un array (alto, ancho, 4) uint8, filas de abajo hacia arriba."""
+    surf = pygame.image.load(path)
+    w, h = surf.get_size()
+    data = pygame.image.tostring(surf, "RGBA", True)
+    return np.frombuffer(data, dtype=np.uint8).reshape(h, w, 4)
+
+def build_mipmaps(image):
+    """Cadena de mipmaps hasta 1x1 promediando bloques de 2x2."""
+    levels = [image]
+    while image.shape[0] > 1 or image.shape[1] > 1:
+        h, w = image.shape[:2]
+        nh, nw = max(1, h // 2), max(1, w // 2)
+        # Recorta a tamaño par (o usa la fila/columna única) y promedia
+        src = image[:nh * 2 if h > 1 else 1, :nw * 2 if w > 1 else 1].astype(np.uint16)
+        src = src.reshape(nh, -1, nw, src.shape[1] // nw, 4)
+        image = (src.sum(axis=(1, 3)) // (src.shape[1] * src.shape[3])).astype(np.uint8)
+        levels.append(image)
+    return levels
+
+def _write_cache(path, levels):
+    st = os.stat(path)
+    header = HEADER.pack(MAGIC, VERSION, st.st_mtime, st.st_size, len(levels))
+    header += b"".join(LEVEL.pack(lv.shape[1], lv.shape[0]) for lv in levels)
+    if len(header) > HEADER_SIZE:
+        return
+    tmp = cache_path(path) + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(header.ljust(HEADER_SIZE, b"\0"))
+            for lv in levels:
+                f.write(np.ascontiguousarray(lv).tobytes())
+        os.replace(tmp, cache_path(path))
+    except OSError:
+        pass
+
+def _read_cache(path):
+    """Niveles mapeados en memoria, o None si la cache falta o está vieja."""
+    try:
+        with open(cache_path(path), "rb") as f:
+            raw = f.read(HEADER_SIZE)
+    except OSError:
+        return None
+    if len(raw) < HEADER_SIZE:
+        return None
+    magic, version, mtime, size, count = HEADER.unpack_from(raw)
+    st = os.stat(path)
+    if magic != MAGIC or version != VERSION or mtime != st.st_mtime or size != st.st_size:
+        return None
+    levels, offset = [], HEADER_SIZE
+    for i in range(count):
+        w, h = LEVEL.unpack_from(raw, HEADER.size + i * LEVEL.size)
+        levels.append(np.memmap(cache_path(path), dtype=np.uint8, mode="r",
+                                offset=offset, shape=(h, w, 4)))
+        offset += w * h * 4
+    return levels
+
+def load_levels(path):
+    """Cadena de mipmaps de la imagen, desde la cache o decodificándola."""
+    levels = _read_cache(path)
+    if levels is None:
+        levels = build_mipmaps(decode_image(path))
+        _write_cache(path, levels)
+    return levels
+
+def upload_texture(levels, repeat=False, max_size=None):
+    """Sube la cadena de mipmaps (saltando niveles mayores que max_size)."""
+    if max_size:
+        while len(levels) > 1 and max(levels[0].shape[:2]) > max_size:
+            levels = levels[1:]
+    height, width = levels[0].shape[:2]
+
+    tex_id = glGenTextures(1)
+    glBindTexture(GL_TEXTURE_2D, tex_id)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT if repeat else GL_CLAMP_TO_EDGE)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT if repeat else GL_CLAMP_TO_EDGE)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAX_LEVEL, len(levels) - 1)
+    glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+    for level, img in enumerate(levels):
+        h, w = img.shape[:2]
+        glTexImage2D(GL_TEXTURE_2D, level, GL_RGBA, w, h, 0,
+                     GL_RGBA, GL_UNSIGNED_BYTE, np.ascontiguousarray(img))
+    glBindTexture(GL_TEXTURE_2D, 0)
+    return tex_id, (width, height)
+
+class TextureManager:
+    """Carga texturas una sola vez: pedir la misma imagen de nuevo devuelve la misma textura."""
+
+    def __init__(self, max_size=None):
+        self.max_size = max_size
+        self.textures = {}
+
+    def add(self, path, levels, repeat=False):
+        """Sube niveles ya decodificados (con load_levels, p. ej. en otro hilo); en el hilo de OpenGL."""
+        key = (os.path.realpath(path), repeat)
+        if key not in self.textures:
+            self.textures[key] = upload_texture(levels, repeat, self.max_size)
+        return self.textures[key]
+
+    def clear(self):
+        if self.textures:
+            glDeleteTextures([tex_id for tex_id, _ in self.textures.values()])
+        self.textures.clear()
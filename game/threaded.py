@@ -0,0 +1,214 @@
+"""
+Simulación en un hilo propio, separada del dibujo.
+
+El hilo de simulación avanza la GameSimulation a paso fijo y, tras cada
+paso, publica un Snapshot inmutable (posiciones, puntaje, vida, partículas)
+en un triple buffer. El hilo de OpenGL toma el último publicado sin
+esperar a la simulación ni la simulación al dibujo: un flip lento o un
+frame pesado ya no atrasan los pasos.
+
+La entrada no queda desacoplada del todo: SDL solo procesa eventos en el
+hilo de la ventana, así que las teclas las lee ese hilo (antes de dibujar
+y otra vez después del flip) y las pasa con set_input(). Mientras el flip
+espera al vsync, los pasos usan las últimas teclas leídas.
+
+La contención del lock del buffer y la edad del snapshot dibujado se
+cuentan aquí y las anota en el profiler el hilo que dibuja; lo que el
+hilo de simulación cuenta por su lado (pausas del GC, instancias nuevas
+del pool) entra en el mismo frame por el lock del profiler.
+"""
+import threading
+import time
+from game.entities import CONEJO, GNOMO, PIEDRA, HEART, SHIELD
+from game.simulation import FixedTimestep
+
+# Grupos de tipos que se dibujan juntos (un lote cada uno)
+GROUPS = ((CONEJO,), (GNOMO,), (PIEDRA,), (HEART, SHIELD))
+
+def _frozen(array):
+    array.flags.writeable = False
+    return array
+
+class Snapshot:
+    """Estado de la partida tras un paso: lo que el dibujo necesita, de solo lectura."""
+
+    __slots__ = ("step", "time", "player_x", "score", "health", "max_health", "combo",
+                 "multiplier", "shield_ms", "game_over", "particles", "_groups")
+
+    def __init__(self, sim, particles, step):
+        self.step = step
+        self.time = time.perf_counter()
+        self.player_x = sim.player_x
+        self.score = sim.score
+        self.health = sim.health
+        self.max_health = sim.max_health
+        self.combo = sim.combo
+        self.multiplier = sim.multiplier
+        self.shield_ms = sim.shield_ms
+        self.game_over = sim.game_over
+        # positions() y live() devuelven arrays nuevos: no comparten memoria con el hilo de simulación
+        self.particles = tuple(_frozen(a) for a in particles.live())
+        groups = {}
+        for kinds in GROUPS:
+            xs, zs, ks = sim.entities.positions(*kinds)
+            prev = sim.entities.positions(*kinds, alpha=0.0)[1]
+            groups[kinds] = (_frozen(xs), _frozen(zs), _frozen(prev), _frozen(ks))
+        self._groups = groups
+
+    def positions(self, *kinds, alpha=1.0):
+        """Como EntityStore.positions, para uno de los GROUPS."""
+        xs, zs, prev, ks = self._groups[kinds]
+        if alpha < 1.0:
+            zs = prev + (zs - prev) * alpha
+        return xs, zs, ks
+
+class TripleBuffer:
+    """
+    Tres ranuras: el escritor llena la de atrás y publish() la cambia por la
+    del medio; latest() cambia la del medio por la del frente si hay algo
+    nuevo. El lock solo protege el intercambio de índices, así que nadie
+    espera a que el otro termine de escribir o de leer.
+    """
+
+    def __init__(self, initial=None):
+        self.slots = [initial] * 3
+        self.back, self.middle, self.front = 0, 1, 2
+        self.fresh = False
+        self.lock = threading.Lock()
+        self.contended = 0   # veces que el lock estaba tomado
+        self.wait_ms = 0.0   # tiempo total esperándolo
+
+    def _acquire(self):
+        if self.lock.acquire(blocking=False):
+            return
+        start = time.perf_counter()
+        self.lock.acquire()
+        self.contended += 1
+        self.wait_ms += (time.perf_counter() - start) * 1000
+
+    def publish(self, value):
+        self.slots[self.back] = value
+        self._acquire()
+        self.back, self.middle = self.middle, self.back
+        self.fresh = True
+        self.lock.release()
+
+    def latest(self):
+        """El último valor publicado (o el mismo de la vez anterior si no hay uno nuevo)."""
+        self._acquire()
+        if self.fresh:
+            self.front, self.middle = self.middle, self.front
+            self.fresh = False
+        self.lock.release()
+        return self.slots[self.front]
+
+    def take_stats(self):
+        """(contenciones, ms esperando el lock) desde la llamada anterior."""
+        self._acquire()
+        stats = self.contended, self.wait_ms
+        self.contended, self.wait_ms = 0, 0.0
+        self.lock.release()
+        return stats
+
+class SimulationThread:
+    """
+    Corre una partida a paso fijo en un hilo y publica un Snapshot por paso.
+
+    Las teclas las pone el hilo principal con set_input(); con playback
+    (Replay.inputs()) se reproducen las grabadas y con recording se graban.
+    El hilo termina solo con el game over o al acabarse el replay.
+    """
+
+    def __init__(self, sim, particles, recording=None, playback=None, max_steps=5):
+        self.sim = sim
+        self.particles = particles
+        self.recording = recording
+        self.playback = playback
+        self.timestep = FixedTimestep(round(1000 / sim.dt_ms), max_steps)
+        self.buffer = TripleBuffer(Snapshot(sim, particles, 0))
+        self.speed = 1.0            # avance rápido de replays
+        self.replay_done = False
+        self.error = None
+        self._input = (False, False)
+        self._steps = 0
+        self._running = threading.Event()
+        self._running.set()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="simulacion", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        """Detiene el hilo y espera a que termine; después sim se puede leer sin carreras."""
+        self._stop.set()
+        self._running.set()
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def set_input(self, left, right):
+        # Una tupla se reemplaza de una vez: el hilo nunca ve un par a medias
+        self._input = (bool(left), bool(right))
+
+    def latest(self):
+        return self.buffer.latest()
+
+    def take_stats(self):
+        """(contenciones, ms esperando el lock) desde la llamada anterior."""
+        return self.buffer.take_stats()
+
+    def _step(self):
+        """Un paso; False si la partida terminó."""
+        sim = self.sim
+        if self.playback is not None:
+            left, right = next(self.playback, (None, None))
+            if left is None:
+                self.replay_done = True
+                return False
+        else:
+            left, right = self._input
+            self.recording.record(left, right)
+        for x, y, z, color in sim.step(left, right):
+            self.particles.emit(x, y, z, color)
+        self.particles.update()
+        self._steps += 1
+        return not sim.game_over
+
+    def _run(self):
+        try:
+            dt = self.timestep.dt_ms / 1000
+            last = time.perf_counter()
+            while not self._stop.is_set():
+                if not self._running.is_set():
+                    # El tiempo en pausa no cuenta para la simulación
+                    self._running.wait()
+                    self.timestep.reset()
+                    last = time.perf_counter()
+                    continue
+                now = time.perf_counter()
+                steps = self.timestep.advance((now - last) * 1000 * self.speed)
+                last = now
+                playing = True
+                for _ in range(steps):
+                    playing = self._step()
+                    if not playing:
+                        break
+                if steps:
+                    self.buffer.publish(Snapshot(self.sim, self.particles, self._steps))
+                if not playing:
+                    break
+                # Tiempo libre hasta el próximo paso: pregenerar oleadas
+                self.sim.spawner.refill()
+                wait = (self.timestep.dt_ms - self.timestep.accumulator) / 1000 / self.speed
+                remaining = wait - (time.perf_counter() - now)
+                if remaining > 0:
+                    time.sleep(min(remaining, dt))
+        except Exception as error:
+            self.error = error
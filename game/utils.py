@@ -1,6 +1,5 @@
-from OpenGL.GL import *
-
 def load_obj(filepath):
+    """Lector línea a línea original; solo queda como referencia en bench.py (el juego usa game.obj)."""
     vertices, faces = [], []
     with open(filepath) as f:
         for line in f:
@@ -12,9 +11,10 @@ def load_obj(filepath):
                 faces.append(face)
     return vertices, faces
 
-def draw_model(vertices, faces):
-    glBegin(GL_QUADS)
+def triangulate(faces):
+    """Convierte caras OBJ (triángulos, quads o n-gons) en índices de triángulos (abanico)."""
+    tris = []
     for face in faces:
-        for vi in face:
-            glVertex3fv(vertices[vi])
-    glEnd()
+        for i in range(1, len(face) - 1):
+            tris.append((face[0], face[i], face[i + 1]))
+    return tris
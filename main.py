@@ -2,16 +2,44 @@ import pygame
 from pygame.locals import *
 from OpenGL.GL import *
 from OpenGL.GLU import *
-import random
-from game.utils import load_obj, draw_model
-from game.conejo import Conejo
+import argparse
+import os
+import time
+from game.mesh import cube_mesh
+from game.batch import MeshBatch, LodBatch
+from game.text import TextRenderer
+from game.particles import ParticlePool
+from game.textures import TextureManager
+from game.assets import AssetManager
+from game.screens import FrameCache, wait_events, REDRAW_EVENTS
+from game.replay import Replay
+from game.profiler import profiler
+from game.gcstats import GCMonitor
+from game.static import TexturedQuad, QuadLayer
+from game.renderer import make_renderer, EYE
+from game.culling import Frustum
 from game.gnomo import Gnomo
 from game.piedra import Piedra
+from game.entities import CONEJO, GNOMO, PIEDRA, HEART, SHIELD, COLORS as ENTITY_COLORS
+from game.simulation import FixedTimestep, SHIELD_MS
+from game.threaded import SimulationThread
 
 # -----------------------
 # Config pantalla
 # -----------------------
 DISPLAY_W, DISPLAY_H = 800, 600
+FPS = 60
+TICK_RATE = 60           # pasos de simulación por segundo
+MAX_CATCH_UP_STEPS = 5   # pasos máximos por frame tras un tirón
+TEXTURE_MAX_SIZE = None  # p. ej. 256 en equipos modestos
+LOD_DISTANCES = (25.0, 50.0)  # distancia a la cámara donde empieza cada LOD
+GC_MODE = "freeze"       # GC durante la partida: None, "freeze" o "disable"
+RENDERER = "fixed"       # escena 3D: "fixed" (pipeline fijo) o "glsl" (shaders)
+SCREEN_WAIT_MS = 1000    # menú/pausa/game over: espera máxima de eventos
+LOADING_WAIT_MS = 30     # ... mientras se cargan assets (avanza la barra)
+REPLAY_DIR = "replays"   # cada partida se guarda aquí al terminar
+REPLAY_FAST_FORWARD = 4  # velocidad de un replay con F presionada
+SIM_THREAD = False       # simulación en su propio hilo (ver game/threaded.py)
 
 # -----------------------
 # Utils 2D: paneles y texto con sombra/contorno
@@ -46,105 +74,36 @@ def draw_panel(x, y, w, h, alpha=0.35):
     glVertex2f(x+w, y+h)
     glVertex2f(x,   y+h)
     glEnd()
+    profiler.count_draw(4)
     _pop_2d()
 
-def draw_text(x, y, text, font, color=(255,255,255), shadow=True, outline=True):
-    surf = font.render(text, True, color).convert_alpha()
-    w, h = surf.get_size()
+# Textos ya rasterizados (texturas en cache LRU)
+text_renderer = TextRenderer()
 
+def draw_text(x, y, text, font, color=(255,255,255), shadow=True, outline=True):
     _push_2d()
-
-    def blit_surface(s, px, py):
-        data = pygame.image.tostring(s, "RGBA", True)
-        glRasterPos2f(px, py)
-        glDrawPixels(s.get_width(), s.get_height(), GL_RGBA, GL_UNSIGNED_BYTE, data)
-
-    if shadow:
-        sh = font.render(text, True, (0, 0, 0)).convert_alpha()
-        sh.set_alpha(140)
-        blit_surface(sh, x+2, y-2)
-
-    if outline:
-        ol = font.render(text, True, (0, 0, 0)).convert_alpha()
-        ol.set_alpha(200)
-        for dx, dy in ((-1,0), (1,0), (0,-1), (0,1)):
-            blit_surface(ol, x+dx, y+dy)
-
-    blit_surface(surf, x, y)
-
+    w, h = text_renderer.draw(x, y, text, font, color, shadow, outline)
     _pop_2d()
     return w, h
 
 # -----------------------
-# Partículas & Barra de vida
+# Fondo y suelo
 # -----------------------
 
-class Particle:
-    def __init__(self, x, y, z, color):
-        self.color = color
-        self.particles = [
-            [x, y, z, random.uniform(-0.1, 0.1), random.uniform(0.05, 0.2), random.uniform(-0.1, 0.1), 30]
-            for _ in range(20)
-        ]
-
-    def update(self):
-        for p in self.particles:
-            p[0] += p[3]
-            p[1] += p[4]
-            p[2] += p[5]
-            p[4] -= 0.01
-            p[6] -= 1
-        self.particles = [p for p in self.particles if p[6] > 0]
-
-    def draw(self):
-        glColor3fv(self.color)
-        glPointSize(4)
-        glBegin(GL_POINTS)
-        for p in self.particles:
-            glVertex3f(p[0], p[1], p[2])
-        glEnd()
-
-def draw_health_bar(health, max_health, x, y, width, height):
-    percent = max(0.0, min(1.0, health / max_health))
-    _push_2d()
-    glBegin(GL_QUADS)
-    glColor4f(0.1, 0.05, 0.05, 0.9)
-    glVertex2f(x, y)
-    glVertex2f(x + width, y)
-    glVertex2f(x + width, y + height)
-    glVertex2f(x, y + height)
-    glColor4f(0.0, 0.8, 0.2, 0.95)
-    glVertex2f(x, y)
-    glVertex2f(x + width * percent, y)
-    glVertex2f(x + width * percent, y + height)
-    glVertex2f(x, y + height)
-    glEnd()
-    _pop_2d()
+# Quads estáticos ya subidos a la GPU, por parámetros
+_baked_quads = {}
 
-# -----------------------
-# Texturas: fondo y helpers
-# -----------------------
-
-def load_texture(path, repeat=False):
-    surf = pygame.image.load(path).convert_alpha()
-    img_data = pygame.image.tostring(surf, "RGBA", True)
-    width, height = surf.get_size()
-
-    tex_id = glGenTextures(1)
-    glBindTexture(GL_TEXTURE_2D, tex_id)
-    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT if repeat else GL_CLAMP_TO_EDGE)
-    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT if repeat else GL_CLAMP_TO_EDGE)
-    glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0,
-                 GL_RGBA, GL_UNSIGNED_BYTE, img_data)
-    glBindTexture(GL_TEXTURE_2D, 0)
-    return tex_id, (width, height)
+def _baked_quad(key, corners, texcoords):
+    quad = _baked_quads.get(key)
+    if quad is None:
+        quad = _baked_quads[key] = TexturedQuad(corners, texcoords)
+    return quad
 
 def draw_background(tex_id):
+    quad = _baked_quad(("fondo", DISPLAY_W, DISPLAY_H),
+                       [(0, 0, 0), (DISPLAY_W, 0, 0), (DISPLAY_W, DISPLAY_H, 0), (0, DISPLAY_H, 0)],
+                       [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)])
     glDisable(GL_DEPTH_TEST)
-    glEnable(GL_TEXTURE_2D)
-    glBindTexture(GL_TEXTURE_2D, tex_id)
 
     glMatrixMode(GL_PROJECTION)
     glPushMatrix()
@@ -154,137 +113,29 @@ def draw_background(tex_id):
     glPushMatrix()
     glLoadIdentity()
 
-    glColor3f(1.0, 1.0, 1.0)
-    glBegin(GL_QUADS)
-    glTexCoord2f(0.0, 0.0); glVertex2f(0,            0)
-    glTexCoord2f(1.0, 0.0); glVertex2f(DISPLAY_W,    0)
-    glTexCoord2f(1.0, 1.0); glVertex2f(DISPLAY_W, DISPLAY_H)
-    glTexCoord2f(0.0, 1.0); glVertex2f(0,         DISPLAY_H)
-    glEnd()
+    quad.draw(tex_id)
 
     glPopMatrix()
     glMatrixMode(GL_PROJECTION)
     glPopMatrix()
     glMatrixMode(GL_MODELVIEW)
 
-    glBindTexture(GL_TEXTURE_2D, 0)
-    glDisable(GL_TEXTURE_2D)
     glEnable(GL_DEPTH_TEST)
 
-# --- UV auto para modelos sin UV (conejo) ---
-
-def enable_auto_texgen():
-    """Genera coordenadas de textura automáticamente (sphere map)."""
-    glEnable(GL_TEXTURE_GEN_S)
-    glEnable(GL_TEXTURE_GEN_T)
-    glTexGeni(GL_S, GL_TEXTURE_GEN_MODE, GL_SPHERE_MAP)
-    glTexGeni(GL_T, GL_TEXTURE_GEN_MODE, GL_SPHERE_MAP)
-
-def disable_auto_texgen():
-    glDisable(GL_TEXTURE_GEN_S)
-    glDisable(GL_TEXTURE_GEN_T)
-
-def draw_ground_textured(tex_id, width=6.0, depth=80.0, repeats_x=6.0, repeats_z=40.0):
+def ground_quad(width=6.0, depth=80.0, repeats_x=6.0, repeats_z=40.0):
     """Suelo plano texturizado desde z=+2 (delante de la cámara) hacia z negativo."""
-    glEnable(GL_TEXTURE_2D)
-    glBindTexture(GL_TEXTURE_2D, tex_id)
-    glColor3f(1.0, 1.0, 1.0)
-
     w = width / 2.0
     z_front = 2.0
     z_far = -depth
-
-    glBegin(GL_QUADS)
-    glTexCoord2f(0.0,        0.0);         glVertex3f(-w, 0.0,  z_front)
-    glTexCoord2f(repeats_x,  0.0);         glVertex3f( w, 0.0,  z_front)
-    glTexCoord2f(repeats_x,  repeats_z);   glVertex3f( w, 0.0,  z_far)
-    glTexCoord2f(0.0,        repeats_z);   glVertex3f(-w, 0.0,  z_far)
-    glEnd()
-
-    glBindTexture(GL_TEXTURE_2D, 0)
-    glDisable(GL_TEXTURE_2D)
-
-# -----------------------
-# Power-ups
-# -----------------------
-
-class PowerUp:
-    COLORS = {"heart": (1.0, 0.2, 0.3), "shield": (0.2, 0.7, 1.0)}
-
-    def __init__(self, kind, lane, z):
-        self.kind = kind
-        self.x = lane
-        self.z = z
-
-    def update(self, speed):
-        self.z += speed
-
-    def draw(self):
-        glPushMatrix()
-        glTranslatef(self.x, 0.25, self.z)
-        glScalef(0.4, 0.4, 0.4)
-        r, g, b = self.COLORS.get(self.kind, (1, 1, 1))
-        glColor3f(r, g, b)
-        glBegin(GL_QUADS)
-        # Top
-        glVertex3f(-0.5, 0.5, -0.5); glVertex3f(0.5, 0.5, -0.5)
-        glVertex3f(0.5, 0.5, 0.5);   glVertex3f(-0.5, 0.5, 0.5)
-        # Bottom
-        glVertex3f(-0.5,-0.5, -0.5); glVertex3f(0.5,-0.5,-0.5)
-        glVertex3f(0.5,-0.5, 0.5);   glVertex3f(-0.5,-0.5, 0.5)
-        # Sides
-        glVertex3f(-0.5,-0.5,-0.5); glVertex3f(-0.5,0.5,-0.5)
-        glVertex3f(0.5,0.5,-0.5);   glVertex3f(0.5,-0.5,-0.5)
-
-        glVertex3f(-0.5,-0.5,0.5); glVertex3f(-0.5,0.5,0.5)
-        glVertex3f(0.5,0.5,0.5);   glVertex3f(0.5,-0.5,0.5)
-
-        glVertex3f(-0.5,-0.5,-0.5); glVertex3f(-0.5,-0.5,0.5)
-        glVertex3f(-0.5,0.5,0.5);   glVertex3f(-0.5,0.5,-0.5)
-
-        glVertex3f(0.5,-0.5,-0.5); glVertex3f(0.5,-0.5,0.5)
-        glVertex3f(0.5,0.5,0.5);   glVertex3f(0.5,0.5,-0.5)
-        glEnd()
-        glPopMatrix()
-
-# -----------------------
-# Spawner
-# -----------------------
-
-def generate_wave(z_pos):
-    options = ["conejo", "gnomo", "piedra"]
-    lanes = [-2, 0, 2]
-    random.shuffle(lanes)
-
-    conejos, gnomos, piedras = [], [], []
-
-    for _ in range(3):
-        obj_type = random.choice(options)
-        options.remove(obj_type)
-        lane = lanes.pop()
-        if obj_type == "conejo":
-            conejos.append(Conejo(lane, z_pos))
-        elif obj_type == "gnomo":
-            gnomos.append(Gnomo(lane, z_pos))
-        elif obj_type == "piedra":
-            piedras.append(Piedra(lane, z_pos))
-
-    # 20% chance de soltar un power-up en un carril libre
-    powerups = []
-    if random.random() < 0.2:
-        libres = set([-2, 0, 2]) - set([o.x for o in conejos + gnomos + piedras])
-        if libres:
-            lane = random.choice(list(libres))
-            kind = random.choice(["heart", "shield"])
-            powerups.append(PowerUp(kind, lane, z_pos))
-
-    return conejos, gnomos, piedras, powerups
+    return _baked_quad(("suelo", width, depth, repeats_x, repeats_z),
+                       [(-w, 0.0, z_front), (w, 0.0, z_front), (w, 0.0, z_far), (-w, 0.0, z_far)],
+                       [(0.0, 0.0), (repeats_x, 0.0), (repeats_x, repeats_z), (0.0, repeats_z)])
 
 # -----------------------
 # Main
 # -----------------------
 
-def main_loop():
+def main_loop(renderer_name=RENDERER, replay_path=None, threaded=SIM_THREAD):
     pygame.init()
     display = (DISPLAY_W, DISPLAY_H)
     screen = pygame.display.set_mode(display, DOUBLEBUF | OPENGL)
@@ -300,38 +151,98 @@ def main_loop():
     pygame.font.init()
     font = pygame.font.SysFont("Arial", 24)
     big_font = pygame.font.SysFont("Arial", 36)
+    small_font = pygame.font.SysFont("Arial", 14)
 
     # OpenGL base
     glEnable(GL_DEPTH_TEST)
     glClearColor(0.0, 0.0, 0.0, 1.0)
 
-    def set_3d_view():
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        gluPerspective(45, (display[0] / display[1]), 0.1, 120.0)
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
-        glTranslatef(0, -1.3, -5)
-
-    # Modelos
-    grass_model  = load_obj("models/grass.obj")
-    conejo_model = load_obj("models/Bunny_lowpoly.obj")
-    gnomo_model  = load_obj("models/gnomo.obj")
-    piedra_model = load_obj("models/cube.obj")
-    player_model = load_obj("models/lawnmower.obj")
-
-    # Texturas
-    sky_tex, _    = load_texture("textures/sky.png")
-    grass_tex, _  = load_texture("textures/grass.png", repeat=True)
-    rabbit_tex, _ = load_texture("textures/rabbit.png")
+    # Backend de la escena 3D (el HUD y los textos siguen en el pipeline fijo)
+    renderer = make_renderer(renderer_name)
+    frustum = Frustum(display[0] / display[1])  # la cámara no se mueve: se calcula una vez
+
+    # Modelos y texturas: se leen en segundo plano mientras ya se ve el menú
+    # (los conejos lejanos usan versiones simplificadas del modelo)
+    textures = TextureManager(max_size=TEXTURE_MAX_SIZE)
+    assets = AssetManager(textures)
+    sky_asset    = assets.load_texture("textures/sky.png")
+    grass_asset  = assets.load_texture("textures/grass.png", repeat=True)
+    rabbit_asset = assets.load_texture("textures/rabbit.png")
+    conejo_asset = assets.load_mesh("models/Bunny_lowpoly.obj", lods=True)
+    gnomo_asset  = assets.load_mesh("models/gnomo.obj")
+    piedra_asset = assets.load_mesh("models/cube.obj")
+    player_asset = assets.load_mesh("models/lawnmower.obj")
+
+    sky_tex = grass_tex = player_model = None
+    conejo_batch = gnomo_batch = piedra_batch = powerup_batch = None
+    loaded = False
+
+    # Suelo texturizado (más grande y un poco elevado)
+    ground = ground_quad(width=12.0, depth=140.0, repeats_x=12.0, repeats_z=70.0)
+
+    def finish_loading():
+        """Lotes por tipo de entidad (una llamada de dibujo por tipo), con los assets ya en la GPU."""
+        nonlocal grass_tex, player_model, conejo_batch, gnomo_batch, piedra_batch, powerup_batch
+        grass_tex, _ = grass_asset.result()
+        rabbit_tex, _ = rabbit_asset.result()
+        player_model = player_asset.result()
+        conejo_batch = LodBatch(conejo_asset.result(), LOD_DISTANCES, camera_z=-EYE[2],
+                                y=0.1, scale=5, rotations=((180, 0, 1, 0), (-90, 1, 0, 0)),
+                                texture=rabbit_tex, sphere_map=True)
+        gnomo_batch = MeshBatch(gnomo_asset.result(), color=Gnomo.COLOR)
+        piedra_batch = MeshBatch(piedra_asset.result(), color=Piedra.COLOR)
+        powerup_batch = MeshBatch(cube_mesh(), y=0.25, scale=0.4)
+
+    def poll_assets():
+        """Sube a la GPU lo que ya se leyó (con presupuesto por frame)."""
+        nonlocal sky_tex, loaded
+        assets.process_uploads()
+        if sky_tex is None and sky_asset.done():
+            sky_tex, _ = sky_asset.result()
+        if not loaded and assets.done():
+            finish_loading()
+            loaded = True
+
+    # Barra de progreso de la carga (menú)
+    loading_bar = QuadLayer()
+    loading_bar.add(250, 260, 300, 14, (0.1, 0.05, 0.05, 0.9))
+    LOADING_FILL = loading_bar.add(250, 260, 0, 14, (0.2, 0.7, 1.0, 0.95))
+
+    # Pausas del GC y memoria reservada por frame (se ven en el profiler)
+    gc_monitor = GCMonitor()
+    gc_monitor.install()
+
+    # Partículas (buffer circular de capacidad fija)
+    particles = ParticlePool(capacity=1024)
 
     clock = pygame.time.Clock()
     state = "menu"
+    start_requested = False  # ENTER durante la carga: arranca al terminar
+    # Replay pedido por línea de comandos: se ve apenas terminen de cargar los assets
+    pending_replay = Replay.load(replay_path) if replay_path else None
+    if pending_replay is not None:
+        start_requested = True
     paused = False
+    show_profiler = False
+
+    # Pantallas estáticas: se dibujan una vez y se guardan en una textura
+    frame_cache = FrameCache(DISPLAY_W, DISPLAY_H)
+
+    def show_screen(key, render, redraw=False):
+        """Dibuja la pantalla si cambió su clave; si no, solo la re-presenta cuando la ventana lo pide."""
+        if key != frame_cache.key:
+            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+            render()
+            frame_cache.capture(key)
+        elif redraw:
+            draw_background(frame_cache.tex_id)
+        else:
+            return
+        pygame.display.flip()
 
     def render_menu():
-        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-        draw_background(sky_tex)
+        if sky_tex is not None:
+            draw_background(sky_tex)
 
         title = "LawnMayhem 3D"
         hint  = "ENTER: Iniciar   ESC: Salir   M: Música"
@@ -345,10 +256,15 @@ def main_loop():
         draw_text((DISPLAY_W - tW)//2, 400, title, big_font)
         draw_text((DISPLAY_W - hW)//2, 320, hint, font)
 
-        pygame.display.flip()
+        if not loaded:
+            progress = assets.progress
+            loading_bar.set_rect(LOADING_FILL, 250, 260, 300 * progress, 14)
+            _push_2d()
+            loading_bar.draw()
+            text_renderer.draw(250, 280, f"Cargando... {progress:.0%}", small_font)
+            _pop_2d()
 
     def render_game_over(score):
-        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
         draw_background(sky_tex)
 
         line1 = "GAME OVER"
@@ -367,39 +283,126 @@ def main_loop():
         draw_text((DISPLAY_W - w2)//2, 360, line2, font)
         draw_text((DISPLAY_W - w3)//2, 300, line3, font)
 
-        pygame.display.flip()
+    def render_pause():
+        draw_background(sky_tex)
 
-    def juego():
-        nonlocal state, music_paused, paused
-        player_x = 0
-        score = 0
-        base_speed = 2.0
-        health = 100
-        max_health = 100
-        particles = []
-        conejos, gnomos, piedras = [], [], []
-        powerups = []
-
-        combo = 0
-        combo_timer = 0          # ms restantes para mantener combo
-        multiplier = 1
-        shield_ms = 0            # tiempo de escudo restante
-        difficulty_timer = 0     # incrementa dificultad cada X ms
-
-        next_wave_z = -10
-        move_cooldown = 0
+        txt1 = "PAUSA"
+        txt2 = "P: Reanudar   ESC: Salir a menú"
+        w1, h1 = big_font.size(txt1)
+        w2, h2 = font.size(txt2)
+
+        draw_panel((DISPLAY_W - (w1+60))//2, 330-5, w1+60, h1+20, 0.35)
+        draw_panel((DISPLAY_W - (w2+60))//2, 280-5, w2+60, h2+20, 0.35)
+        draw_text((DISPLAY_W - w1)//2, 330, txt1, big_font)
+        draw_text((DISPLAY_W - w2)//2, 280, txt2, font)
+
+    # HUD: paneles y barras en un solo VBO; cada frame solo cambian los anchos
+    hud = QuadLayer()
+    hud.add(14, 564, 212, 30, (0.0, 0.0, 0.0, 0.25))
+    hud.add(20, 570, 200, 20, (0.1, 0.05, 0.05, 0.9))
+    HUD_HEALTH_FILL  = hud.add(20, 570, 200, 20, (0.0, 0.8, 0.2, 0.95))
+    HUD_SCORE_PANEL  = hud.add(0, 560, 0, 0, (0.0, 0.0, 0.0, 0.25))
+    HUD_COMBO_PANEL  = hud.add(20, 530, 0, 0, (0.0, 0.0, 0.0, 0.25), visible=False)
+    HUD_SHIELD_PANEL = hud.add(14, 500, 212, 22, (0.0, 0.0, 0.0, 0.25), visible=False)
+    HUD_SHIELD_FILL  = hud.add(20, 505, 200, 15, (0.2, 0.7, 1.0, 0.95), visible=False)
+
+    def draw_hud(sim):
+        percent = max(0.0, min(1.0, sim.health / sim.max_health))
+        hud.set_rect(HUD_HEALTH_FILL, 20, 570, 200 * percent, 20)
+
+        puntos_txt = f"Puntos: {sim.score}"
+        pw, ph = big_font.size(puntos_txt)
+        hud.set_rect(HUD_SCORE_PANEL, DISPLAY_W - (pw+30) - 20, 560, pw+30, ph+16)
+
+        # Combo / Multiplicador
+        combo_txt = None
+        if sim.multiplier > 1:
+            combo_txt = f"Combo {sim.combo}  x{sim.multiplier}"
+            cw, ch = font.size(combo_txt)
+            hud.set_rect(HUD_COMBO_PANEL, 20, 530, cw+18, ch+12)
+        hud.set_visible(HUD_COMBO_PANEL, combo_txt is not None)
+
+        # Barra de escudo
+        shield = sim.shield_ms > 0
+        if shield:
+            hud.set_rect(HUD_SHIELD_FILL, 20, 505, 200 * sim.shield_ms / SHIELD_MS, 15)
+        hud.set_visible(HUD_SHIELD_PANEL, shield)
+        hud.set_visible(HUD_SHIELD_FILL, shield)
+
+        # Una sola pasada 2D para paneles y textos
+        _push_2d()
+        hud.draw()
+        text_renderer.draw(DISPLAY_W - (pw) - 28, 570, puntos_txt, big_font)
+        if combo_txt is not None:
+            text_renderer.draw(28, 536, combo_txt, font)
+        if shield:
+            text_renderer.draw(24, 503, "Escudo", font)
+        _pop_2d()
+
+    # Overlay del profiler (F3); el texto se refresca cada 500 ms para no llenar la cache
+    overlay_lines = []
+    overlay_updated = -1000
+
+    def draw_profiler_overlay(live_particles, pools):
+        nonlocal overlay_lines, overlay_updated
+        now = pygame.time.get_ticks()
+        if now - overlay_updated >= 500:
+            overlay_updated = now
+            overlay_lines = [f"FPS {clock.get_fps():.0f}   (p50 / p95 / p99)",
+                             f"partículas vivas: {live_particles}"]
+            gc_stats = gc_monitor.stats()
+            overlay_lines.append(f"gc: {'/'.join(map(str, gc_stats['collections']))} colecciones, "
+                                 f"pausa máx {gc_stats['max_pause_ms']:.2f} ms, "
+                                 f"{gc_stats['frozen_objects']} congelados")
+            pool_stats = {cls.__name__: pool.stats() for cls, pool in pools.items()}
+            overlay_lines.append("pools (creadas/en uso): " + "  ".join(
+                f"{name} {stats['created']}/{stats['in_use']}" for name, stats in pool_stats.items()))
+            for name, (p50, p95, p99) in sorted(profiler.summary().items()):
+                if name in profiler.counters:
+                    overlay_lines.append(f"{name}: {p50:.0f} / {p95:.0f} / {p99:.0f}")
+                else:
+                    overlay_lines.append(f"{name}: {p50:.2f} / {p95:.2f} / {p99:.2f} ms")
+        line_h = small_font.get_linesize()
+        draw_panel(8, DISPLAY_H - 140 - line_h * len(overlay_lines), 300, line_h * len(overlay_lines) + 10, alpha=0.5)
+        for i, line in enumerate(overlay_lines):
+            draw_text(14, DISPLAY_H - 140 - line_h * (i + 1), line, small_font, shadow=False)
+
+    def export_profile():
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        profiler.export(f"profile_{stamp}.json")
+        profiler.export(f"profile_{stamp}.csv")
+
+    def save_replay(recording):
+        if recording.steps == 0:
+            return
+        os.makedirs(REPLAY_DIR, exist_ok=True)
+        recording.save(os.path.join(REPLAY_DIR, f"replay_{time.strftime('%Y%m%d_%H%M%S')}.lmr"))
+
+    def juego(replay=None):
+        """Una partida; con replay se reproduce la grabada en vez de leer el teclado."""
+        nonlocal state, music_paused, paused, show_profiler
+        if replay is None:
+            recording = Replay(tick_rate=TICK_RATE)
+            playback = None
+            sim = recording.new_simulation()
+        else:
+            recording = None
+            playback = replay.inputs()
+            sim = replay.new_simulation()
+        timestep = FixedTimestep(round(1000 / sim.dt_ms), MAX_CATCH_UP_STEPS)
+        particles.kill()
+        # En modo hilo la simulación (y las partículas) son del hilo: aquí solo se leen snapshots
+        runner = None
+        if threaded:
+            runner = SimulationThread(sim, particles, recording, playback, MAX_CATCH_UP_STEPS)
+            runner.start()
+            last_step = 0
+        frame_cache.invalidate()  # la pantalla ya no es la guardada
+        redraw = False
         running = True
 
         while running:
-            dt_ms = clock.tick(60)
-            dt_scale = dt_ms / 16.6667
-            now = pygame.time.get_ticks()
-
-            # Rampa de dificultad
-            difficulty_timer += dt_ms
-            if difficulty_timer >= 8000:
-                difficulty_timer = 0
-                base_speed = min(base_speed + 0.15, 6.0)
+            dt_ms = clock.tick(FPS)
 
             for e in pygame.event.get():
                 if e.type == QUIT:
@@ -415,24 +418,19 @@ def main_loop():
                             music_paused = True
                     elif e.key == K_p:
                         paused = not paused
+                    elif e.key == K_F3:
+                        show_profiler = not show_profiler
+                    elif e.key == K_F4:
+                        export_profile()
 
             if paused:
-                glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-                draw_background(sky_tex)
-
-                txt1 = "PAUSA"
-                txt2 = "P: Reanudar   ESC: Salir a menú"
-                w1, h1 = big_font.size(txt1)
-                w2, h2 = font.size(txt2)
-
-                draw_panel((DISPLAY_W - (w1+60))//2, 330-5, w1+60, h1+20, 0.35)
-                draw_panel((DISPLAY_W - (w2+60))//2, 280-5, w2+60, h2+20, 0.35)
-                draw_text((DISPLAY_W - w1)//2, 330, txt1, big_font)
-                draw_text((DISPLAY_W - w2)//2, 280, txt2, font)
-
-                pygame.display.flip()
-
-                for e in pygame.event.get():
+                # Sin redibujar ni simular: se duerme hasta el próximo evento
+                if runner is not None:
+                    runner.pause()
+                show_screen(("pausa",), render_pause, redraw)
+                events = wait_events(SCREEN_WAIT_MS)
+                redraw = any(e.type in REDRAW_EVENTS for e in events)
+                for e in events:
                     if e.type == QUIT:
                         running = False
                         state = "salir"
@@ -442,187 +440,156 @@ def main_loop():
                         elif e.key == K_ESCAPE:
                             running = False
                             state = "menu"
+                if not paused:
+                    # El tiempo en pausa no cuenta para la simulación
+                    frame_cache.invalidate()
+                    clock.tick()
+                    timestep.reset()
+                    if runner is not None:
+                        runner.resume()
                 continue
 
-            keys = pygame.key.get_pressed()
-            if keys[K_LEFT] and player_x > -2 and now - move_cooldown > 120:
-                player_x -= 2
-                move_cooldown = now
-            if keys[K_RIGHT] and player_x < 2 and now - move_cooldown > 120:
-                player_x += 2
-                move_cooldown = now
+            # Lógica a paso fijo (independiente de los FPS)
+            replay_done = False
+            if runner is not None:
+                # Último snapshot publicado, interpolado según su edad
+                keys = pygame.key.get_pressed()
+                runner.set_input(keys[K_LEFT], keys[K_RIGHT])
+                runner.speed = REPLAY_FAST_FORWARD if playback is not None and keys[K_f] else 1.0
+                view = runner.latest()
+                age_ms = (time.perf_counter() - view.time) * 1000
+                alpha = min(age_ms * runner.speed / sim.dt_ms, 1.0)
+                contended, wait_ms = runner.take_stats()
+                profiler.add_time("snapshot_edad", age_ms)
+                profiler.add_time("snapshot_espera", wait_ms)
+                profiler.count("snapshot_contencion", contended)
+                profiler.count("sim_pasos", view.step - last_step)
+                last_step = view.step
+                positions = view.positions
+                replay_done = runner.replay_done
+                if runner.error is not None:
+                    runner.stop()  # relanza aquí el error del hilo de simulación
+            else:
+                with profiler.scope("simulacion"):
+                    keys = pygame.key.get_pressed()
+                    left, right = keys[K_LEFT], keys[K_RIGHT]
+                    if playback is not None and keys[K_f]:
+                        dt_ms *= REPLAY_FAST_FORWARD
+                    for _ in range(timestep.advance(dt_ms)):
+                        if playback is not None:
+                            left, right = next(playback, (None, None))
+                            if left is None:
+                                replay_done = True
+                                break
+                        else:
+                            recording.record(left, right)
+                        for x, y, z, color in sim.step(left, right):
+                            particles.emit(x, y, z, color)
+                        particles.update()
+                        if sim.game_over:
+                            break
+                    alpha = timestep.alpha
+                view, positions = sim, sim.entities.positions
+            if replay_done:
+                # La partida grabada terminó sin game over (se salió al menú)
+                state = "menu"
+                break
 
             glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
 
             # Fondo 2D
-            draw_background(sky_tex)
+            with profiler.scope("fondo"):
+                draw_background(sky_tex)
 
             # Escena 3D
-            set_3d_view()
-
-            # Spawner
-            if all(c.z > -30 for c in conejos + gnomos + piedras + powerups):
-                wc, wg, wp, wpu = generate_wave(next_wave_z)
-                conejos += wc; gnomos += wg; piedras += wp; powerups += wpu
-                next_wave_z -= 6
-
-            speed = base_speed * dt_scale
-
-            # Timers
-            if combo_timer > 0:
-                combo_timer = max(0, combo_timer - dt_ms)
-                if combo_timer == 0:
-                    combo = 0
-                    multiplier = 1
-            if shield_ms > 0:
-                shield_ms = max(0, shield_ms - dt_ms)
-
-            # Actualizar & colisiones
-            for c in conejos:
-                c.update(speed)
-                if c.check_collision(player_x):
-                    score += 10 * multiplier
-                    combo += 1
-                    combo_timer = 2500
-                    multiplier = 1 + (combo // 5)
-                    particles.append(Particle(c.x, 0.5, c.z, (1, 0.4, 0.4)))
-            for g in gnomos:
-                g.update(speed)
-                if g.check_collision(player_x):
-                    score -= 5
-                    combo = 0; multiplier = 1; combo_timer = 0
-                    particles.append(Particle(g.x, 0.5, g.z, (1, 0.5, 1)))
-            for p in piedras:
-                p.update(speed)
-                if p.check_collision(player_x):
-                    if shield_ms > 0:
-                        particles.append(Particle(p.x, 0.5, p.z, (0.4, 0.7, 1.0)))
-                    else:
-                        health -= 10
-                        combo = 0; multiplier = 1; combo_timer = 0
-                        particles.append(Particle(p.x, 0.5, p.z, (1, 1, 0)))
-
-            # Power-ups
-            for pu in powerups:
-                pu.update(speed)
-                if abs(pu.x - player_x) < 0.1 and -1.5 < pu.z < 0.5:
-                    if pu.kind == "heart":
-                        health = min(max_health, health + 20)
-                    elif pu.kind == "shield":
-                        shield_ms = 4000
-                    particles.append(Particle(pu.x, 0.6, pu.z, (0.9, 0.9, 1.0)))
-                    pu.z = 999  # mark for deletion
-
-            # Descartes
-            conejos[:] = [c for c in conejos if c.z < 5]
-            gnomos[:] = [g for g in gnomos if g.z < 5]
-            piedras[:] = [p for p in piedras if p.z < 5]
-            powerups[:] = [pu for pu in powerups if pu.z < 5]
-
-            # Suelo texturizado (más grande y un poco elevado)
-            glPushMatrix()
-            glTranslatef(0.0, -0.25, 0.0)
-            draw_ground_textured(
-                grass_tex,
-                width=12.0,
-                depth=140.0,
-                repeats_x=12.0,
-                repeats_z=70.0
-            )
-            glPopMatrix()
-
-            # Conejos (textura con UV auto si no existen)
-            for c in conejos:
-                glPushMatrix()
-                glTranslatef(c.x, 0.1, c.z)
-                glRotatef(180, 0, 1, 0)
-                glRotatef(-90, 1, 0, 0)
-                glScalef(5, 5, 5)
-
-                glEnable(GL_TEXTURE_2D)
-                glBindTexture(GL_TEXTURE_2D, rabbit_tex)
-                glColor3f(1.0, 1.0, 1.0)
-
-                enable_auto_texgen()
-                draw_model(*conejo_model)
-                disable_auto_texgen()
-
-                glBindTexture(GL_TEXTURE_2D, 0)
-                glDisable(GL_TEXTURE_2D)
-                glPopMatrix()
-
-            # Power-ups draw
-            for pu in powerups:
-                pu.draw()
-
-            # Otros
-            for g in gnomos:
-                g.draw(gnomo_model)
-            for p in piedras:
-                p.draw(piedra_model)
-
-            # Jugador
-            glPushMatrix()
-            glTranslatef(player_x, 0, -1)
-            glColor3f(1.0, 0.0, 0.0)
-            draw_model(*player_model)
-            glPopMatrix()
+            renderer.begin_scene(display[0] / display[1])
+
+            with profiler.scope("suelo"):
+                renderer.draw_quad(ground, grass_tex, offset=(0.0, -0.25, 0.0))
+
+            # Entidades por lotes, solo las que entran en la cámara
+            # (conejos con textura y UV auto si no existen)
+            with profiler.scope("entidades"):
+                xs, zs, _ = positions(CONEJO, alpha=alpha)
+                renderer.draw_batch(conejo_batch, *frustum.cull_batch(conejo_batch, xs, zs))
+                xs, zs, _ = positions(GNOMO, alpha=alpha)
+                renderer.draw_batch(gnomo_batch, *frustum.cull_batch(gnomo_batch, xs, zs))
+                xs, zs, _ = positions(PIEDRA, alpha=alpha)
+                renderer.draw_batch(piedra_batch, *frustum.cull_batch(piedra_batch, xs, zs))
+                xs, zs, kinds = positions(HEART, SHIELD, alpha=alpha)
+                renderer.draw_batch(powerup_batch,
+                                    *frustum.cull_batch(powerup_batch, xs, zs, ENTITY_COLORS[kinds]))
+
+                # Jugador
+                renderer.draw_mesh(player_model, (view.player_x, 0, -1), (1.0, 0.0, 0.0))
 
             # Partículas
-            for particle in particles[:]:
-                particle.update()
-                particle.draw()
-                if not particle.particles:
-                    particles.remove(particle)
+            with profiler.scope("particulas"):
+                live = view.particles if runner is not None else particles.live()
+                renderer.draw_particles(*frustum.cull_points(*live))
+            renderer.end_scene()
 
             # HUD
-            draw_panel(14, 564, 212, 30, alpha=0.25)
-            draw_health_bar(health, max_health, 20, 570, 200, 20)
-
-            puntos_txt = f"Puntos: {score}"
-            pw, ph = big_font.size(puntos_txt)
-            draw_panel(DISPLAY_W - (pw+30) - 20, 560, pw+30, ph+16, alpha=0.25)
-            draw_text(DISPLAY_W - (pw) - 28, 570, puntos_txt, big_font)
-
-            # Combo / Multiplicador
-            if multiplier > 1:
-                txt = f"Combo {combo}  x{multiplier}"
-                cw, ch = font.size(txt)
-                draw_panel(20, 530, cw+18, ch+12, alpha=0.25)
-                draw_text(28, 536, txt, font)
-
-            # Barra de escudo
-            if shield_ms > 0:
-                pct = shield_ms / 4000.0
-                w = 200
-                draw_panel(14, 500, w+12, 22, alpha=0.25)
-                _push_2d()
-                glBegin(GL_QUADS)
-                glColor4f(0.2, 0.7, 1.0, 0.95)
-                glVertex2f(20, 505)
-                glVertex2f(20 + w*pct, 505)
-                glVertex2f(20 + w*pct, 520)
-                glVertex2f(20, 520)
-                glEnd()
-                _pop_2d()
-                draw_text(24, 503, "Escudo", font)
-
-            if health <= 0:
-                state = "game_over"
-                return score
+            with profiler.scope("hud"):
+                draw_hud(view)
 
-            pygame.display.flip()
+            if view.game_over:
+                state = "game_over"
+                gc_monitor.sample_frame()
+                profiler.end_frame()
+                if runner is not None:
+                    runner.stop()
+                if recording is not None:
+                    recording.finish(sim)
+                    save_replay(recording)
+                return sim.score
+
+            if show_profiler:
+                draw_profiler_overlay(len(view.particles[0]) if runner is not None
+                                      else particles.live_count(), sim.spawner.pools)
+
+            with profiler.scope("flip"):
+                pygame.display.flip()
+            gc_monitor.sample_frame()
+            profiler.end_frame()
+
+            # Tiempo ocioso del frame: pregenerar oleadas para los próximos
+            if runner is None:
+                sim.spawner.refill()
+            else:
+                # Las teclas de SDL solo se actualizan en este hilo: se vuelven a leer
+                # tras el flip (que puede esperar al vsync) y no recién en el próximo frame
+                pygame.event.pump()
+                keys = pygame.key.get_pressed()
+                runner.set_input(keys[K_LEFT], keys[K_RIGHT])
+
+        # Se salió sin game over: la partida también queda grabada
+        if runner is not None:
+            runner.stop()
+        if recording is not None:
+            recording.finish(sim)
+            save_replay(recording)
 
     score_final = 0
+    redraw = False
     while state != "salir":
         if state == "menu":
-            render_menu()
-            for event in pygame.event.get():
+            poll_assets()
+            if start_requested and loaded:
+                # ENTER durante la carga o --replay: se arranca apenas termina, sin esperar eventos
+                start_requested = False
+                state = "juego"
+                continue
+            show_screen(("menu", sky_tex is not None, loaded, round(assets.progress, 2)),
+                        render_menu, redraw)
+            events = wait_events(SCREEN_WAIT_MS if loaded else LOADING_WAIT_MS)
+            redraw = any(event.type in REDRAW_EVENTS for event in events)
+            for event in events:
                 if event.type == QUIT:
                     state = "salir"
                 elif event.type == KEYDOWN:
                     if event.key == K_RETURN:
-                        state = "juego"
+                        start_requested = True
                     elif event.key == K_ESCAPE:
                         state = "salir"
                     elif event.key == K_m:
@@ -632,13 +599,21 @@ def main_loop():
                         else:
                             pygame.mixer.music.pause()
                             music_paused = True
+            if start_requested and loaded and state == "menu":
+                start_requested = False
+                state = "juego"
 
         elif state == "juego":
-            score_final = juego()
+            gc_monitor.gameplay_begin(GC_MODE)
+            score_final = juego(pending_replay)
+            pending_replay = None
+            gc_monitor.gameplay_end()
 
         elif state == "game_over":
-            render_game_over(score_final)
-            for event in pygame.event.get():
+            show_screen(("game_over", score_final), lambda: render_game_over(score_final), redraw)
+            events = wait_events(SCREEN_WAIT_MS)
+            redraw = any(event.type in REDRAW_EVENTS for event in events)
+            for event in events:
                 if event.type == QUIT:
                     state = "salir"
                 elif event.type == KEYDOWN:
@@ -654,7 +629,21 @@ def main_loop():
                             pygame.mixer.music.pause()
                             music_paused = True
 
+    # Recursos de la GPU: se liberan mientras el contexto sigue vivo
+    text_renderer.clear()
+    textures.clear()
+    assets.shutdown()  # también borra los modelos ya subidos
+
+    gc_monitor.uninstall()
     pygame.quit()
 
 if __name__ == "__main__":
-    main_loop()
+    parser = argparse.ArgumentParser(description="LawnMayhem 3D")
+    parser.add_argument("--renderer", choices=("fixed", "glsl"), default=RENDERER,
+                        help="backend de la escena 3D (por defecto: %(default)s)")
+    parser.add_argument("--replay", metavar="ARCHIVO",
+                        help="reproduce una partida grabada (F: avance rápido)")
+    parser.add_argument("--threaded", action="store_true", default=SIM_THREAD,
+                        help="simula en un hilo aparte y dibuja el último estado publicado")
+    args = parser.parse_args()
+    main_loop(args.renderer, args.replay, args.threaded)